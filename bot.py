@@ -8,9 +8,9 @@ import os
 import sys
 import asyncio
 import logging
-from threading import Thread
-from flask import Flask, jsonify
 import signal
+from urllib.parse import urlsplit
+from aiohttp import web
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -19,32 +19,24 @@ load_dotenv()
 # Add src directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from telegram_handler import TelegramBot
-from database import init_database
-from data_handler import MarketDataHandler
-from strategy import StrategyManager
-from reporting import ReportingSystem
+from config import CFG
 from logger import setup_logging
 
 # Setup logging
 logger = setup_logging()
 
-# Flask app for health checks (required by Render)
-app = Flask(__name__)
-
-@app.route('/health')
-def health_check():
+# Health check endpoints (required by Render), served on the bot's event loop
+async def health_check(request: web.Request) -> web.Response:
     """Health check endpoint for Render"""
-    return jsonify({
+    return web.json_response({
         'status': 'healthy',
         'service': 'telegram-trading-bot',
-        'timestamp': os.environ.get('RENDER_SERVICE_ID', 'local')
+        'timestamp': CFG.render_service_id
     })
 
-@app.route('/')
-def index():
+async def index(request: web.Request) -> web.Response:
     """Root endpoint"""
-    return jsonify({
+    return web.json_response({
         'message': 'Telegram Trading Bot is running',
         'status': 'active'
     })
@@ -58,12 +50,22 @@ class TradingBotOrchestrator:
         self.strategy_manager = None
         self.reporting = None
         self.running = False
+        self._tasks = []
     
     async def initialize(self):
         """Initialize all components"""
         try:
             logger.info("🚀 Initializing Telegram Trading Bot...")
             
+            # Import components here rather than at module load so the health
+            # check server is already answering while the heavy dependencies
+            # (SQLAlchemy, telegram, NumPy) are loaded
+            from database import init_database, get_session_factory
+            from data_handler import MarketDataHandler
+            from strategy import StrategyManager
+            from reporting import ReportingSystem
+            from telegram_handler import TelegramBot
+            
             # Initialize database
             await init_database()
             logger.info("✅ Database initialized")
@@ -75,7 +77,8 @@ class TradingBotOrchestrator:
             self.telegram_bot = TelegramBot(
                 market_data=self.market_data,
                 strategy_manager=self.strategy_manager,
-                reporting=self.reporting
+                reporting=self.reporting,
+                session_factory=await get_session_factory()
             )
             
             logger.info("✅ All components initialized")
@@ -87,19 +90,26 @@ class TradingBotOrchestrator:
     async def start(self):
         """Start the trading bot"""
         try:
-            await self.initialize()
             self.running = True
+            await asyncio.wait_for(self.initialize(), timeout=60.0)
+            if not self.running:
+                # A shutdown signal arrived while we were still initializing
+                return
             
             logger.info("🎯 Starting Telegram Trading Bot...")
             
-            # Start all components
-            await asyncio.gather(
-                self.telegram_bot.start(),
-                self.strategy_manager.start_monitoring(),
-                self.reporting.start_daily_reports(),
-                self.market_data.start_data_collection()
-            )
+            # Start all components; stop() cancels these tasks
+            async with asyncio.TaskGroup() as tg:
+                self._tasks = [
+                    tg.create_task(self.telegram_bot.start()),
+                    tg.create_task(self.strategy_manager.start_monitoring()),
+                    tg.create_task(self.reporting.start_daily_reports()),
+                    tg.create_task(self.market_data.start_data_collection())
+                ]
             
+        except asyncio.TimeoutError:
+            logger.error("Bot startup timed out after 60 seconds")
+            raise
         except Exception as e:
             logger.error(f"❌ Bot start failed: {e}")
             raise
@@ -110,6 +120,9 @@ class TradingBotOrchestrator:
             logger.info("🛑 Stopping Telegram Trading Bot...")
             self.running = False
             
+            for task in self._tasks:
+                task.cancel()
+            
             if self.telegram_bot:
                 await self.telegram_bot.stop()
             if self.strategy_manager:
@@ -120,53 +133,85 @@ class TradingBotOrchestrator:
                 await self.market_data.stop()
                 
             logger.info("✅ Bot stopped gracefully")
+    
+    async def telegram_webhook(self, request: web.Request) -> web.Response:
+        """Receive an update pushed by Telegram (WEBHOOK_URL mode)"""
+        if self.telegram_bot is None:
+            # Still initializing; Telegram redelivers on non-2xx responses
+            return web.Response(status=503)
+        if not self.telegram_bot.webhook_secret_matches(
+            request.headers.get('X-Telegram-Bot-Api-Secret-Token')
+        ):
+            return web.Response(status=403)
+        try:
+            data = await request.json()
+        except ValueError:
+            # Includes json.JSONDecodeError
+            return web.Response(status=400)
+        if not await self.telegram_bot.process_webhook_update(data):
+            return web.Response(status=503)
+        return web.Response()
 
-def run_flask_app():
-    """Run Flask app in a separate thread for health checks"""
-    port = int(os.environ.get('PORT', 8080))
-    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
+async def start_health_server(bot_orchestrator: TradingBotOrchestrator) -> web.AppRunner:
+    """Start the health check server on the running event loop
+    
+    In webhook mode it also receives Telegram updates, since hosts like Render
+    route only the single PORT to the service.
+    """
+    app = web.Application()
+    app.router.add_get('/health', health_check)
+    app.router.add_get('/', index)
+    if CFG.webhook_url:
+        app.router.add_post(urlsplit(CFG.webhook_url).path or '/', bot_orchestrator.telegram_webhook)
+    
+    runner = web.AppRunner(app)
+    await runner.setup()
+    
+    await web.TCPSite(runner, '0.0.0.0', CFG.port).start()
+    return runner
 
 async def main():
     """Main function"""
     bot_orchestrator = TradingBotOrchestrator()
     
-    # Setup signal handlers for graceful shutdown
-    def signal_handler(signum, frame):
-        logger.info(f"Received signal {signum}, shutting down...")
-        bot_orchestrator.running = False
+    # Setup signal handlers for graceful shutdown; they run inside the event
+    # loop, so they can schedule the stop coroutine directly
+    loop = asyncio.get_running_loop()
+    shutdown_tasks = []
     
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    def signal_handler(signum):
+        logger.info(f"Received signal {signum.name}, shutting down...")
+        shutdown_tasks.append(asyncio.create_task(bot_orchestrator.stop()))
     
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, signal_handler, sig)
+        except NotImplementedError:
+            # Windows: Ctrl+C still raises KeyboardInterrupt
+            pass
+    
+    health_runner = None
     try:
-        # Start Flask server in background thread for health checks
-        flask_thread = Thread(target=run_flask_app, daemon=True)
-        flask_thread.start()
+        # Start health check server alongside the bot
+        health_runner = await start_health_server(bot_orchestrator)
         logger.info("🌐 Health check server started")
         
-        # Start the trading bot with timeout
-        try:
-            await asyncio.wait_for(bot_orchestrator.start(), timeout=60.0)
-        except asyncio.TimeoutError:
-            logger.error("Bot startup timed out after 60 seconds")
-            raise
+        # Start the trading bot
+        await bot_orchestrator.start()
         
     except KeyboardInterrupt:
         logger.info("📱 Keyboard interrupt received")
     except Exception as e:
         logger.error(f"❌ Unexpected error: {e}")
     finally:
+        await asyncio.gather(*shutdown_tasks)
         await bot_orchestrator.stop()
+        if health_runner:
+            await health_runner.cleanup()
 
 if __name__ == "__main__":
     # Check for required environment variables
-    required_env_vars = [
-        'TELEGRAM_BOT_TOKEN',
-        'DATABASE_URL',
-        'ALPHA_VANTAGE_API_KEY'
-    ]
-    
-    missing_vars = [var for var in required_env_vars if not os.getenv(var)]
+    missing_vars = CFG.missing_required()
     if missing_vars:
         logger.error(f"❌ Missing required environment variables: {missing_vars}")
         sys.exit(1)
@@ -0,0 +1,24 @@
+-- Convert text UUID primary keys to native uuid columns.
+-- New databases get this schema from init_database(); run this once against
+-- databases created before the change:
+--   psql "$DATABASE_URL" -f deployment/migrations/001_uuid_primary_keys.sql
+-- ALTER COLUMN ... TYPE rewrites each table and rebuilds its indexes.
+
+BEGIN;
+
+ALTER TABLE trades DROP CONSTRAINT IF EXISTS trades_signal_id_fkey;
+
+ALTER TABLE trading_signals ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE trades
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN signal_id TYPE uuid USING signal_id::uuid;
+ALTER TABLE strategy_performance ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE system_events ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE market_data ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE user_interactions ALTER COLUMN id TYPE uuid USING id::uuid;
+
+ALTER TABLE trades
+    ADD CONSTRAINT trades_signal_id_fkey
+    FOREIGN KEY (signal_id) REFERENCES trading_signals (id);
+
+COMMIT;
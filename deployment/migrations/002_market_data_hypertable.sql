@@ -0,0 +1,15 @@
+-- Prepare market_data for TimescaleDB: hypertable unique keys must include
+-- the partitioning column, and uq_market_data already serves
+-- (symbol, timeframe, timestamp) lookups, so the separate indexes go away.
+-- init_database() creates the hypertable itself once this has been applied:
+--   psql "$DATABASE_URL" -f deployment/migrations/002_market_data_hypertable.sql
+
+BEGIN;
+
+ALTER TABLE market_data DROP CONSTRAINT market_data_pkey;
+ALTER TABLE market_data ADD PRIMARY KEY (id, timestamp);
+
+DROP INDEX IF EXISTS idx_market_data_symbol_timeframe;
+DROP INDEX IF EXISTS idx_market_data_timestamp;
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- Replace single-column indexes with covering indexes matching the bot's
+-- read patterns (index-only scans for recent signals, trades and bars):
+--   psql "$DATABASE_URL" -f deployment/migrations/003_covering_indexes.sql
+
+CREATE INDEX IF NOT EXISTS idx_trading_signals_symbol_status_created
+    ON trading_signals (symbol, status, created_at)
+    INCLUDE (signal_type, entry_price, stop_loss, take_profit);
+DROP INDEX IF EXISTS idx_trading_signals_symbol;
+
+CREATE INDEX IF NOT EXISTS idx_trades_status_symbol_entered
+    ON trades (status, symbol, entered_at);
+DROP INDEX IF EXISTS idx_trades_status;
+
+CREATE INDEX IF NOT EXISTS idx_market_data_symbol_tf_ts
+    ON market_data (symbol, timeframe, "timestamp" DESC)
+    INCLUDE (open_price, high_price, low_price, close_price, volume);
@@ -0,0 +1,12 @@
+-- Index only the hot ACTIVE signals / OPEN trades instead of every
+-- historical row:
+--   psql "$DATABASE_URL" -f deployment/migrations/004_partial_status_indexes.sql
+
+CREATE INDEX IF NOT EXISTS idx_trading_signals_active
+    ON trading_signals (symbol, created_at)
+    WHERE status = 'ACTIVE';
+DROP INDEX IF EXISTS idx_trading_signals_status;
+
+CREATE INDEX IF NOT EXISTS idx_trades_open
+    ON trades (symbol, entered_at)
+    WHERE status = 'OPEN';
@@ -0,0 +1,17 @@
+-- Generate primary keys in the database instead of in Python.
+-- New databases get these defaults from init_database(); run this once against
+-- databases created before the change:
+--   psql "$DATABASE_URL" -f deployment/migrations/005_server_side_uuid_defaults.sql
+-- gen_random_uuid() is built in from PostgreSQL 13 (pgcrypto on older servers).
+-- Setting a default is a catalog-only change; no table is rewritten.
+
+BEGIN;
+
+ALTER TABLE trading_signals ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE trades ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE strategy_performance ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE system_events ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE market_data ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE user_interactions ALTER COLUMN id SET DEFAULT gen_random_uuid();
+
+COMMIT;
@@ -16,6 +16,7 @@ load_dotenv()
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from telegram import Bot
+from config import CFG
 from logger import setup_logging
 
 # Setup logging
@@ -25,8 +26,8 @@ async def main():
     """Simple bot startup"""
     
     # Get credentials
-    token = os.getenv('TELEGRAM_BOT_TOKEN')
-    chat_id = os.getenv('TELEGRAM_CHAT_ID')
+    token = CFG.telegram_bot_token
+    chat_id = CFG.telegram_chat_id
     
     if not token or not chat_id:
         logger.error("Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID")
@@ -63,10 +64,19 @@ async def main():
         logger.info("✅ Startup message sent!")
         logger.info("🎯 Bot is ready. Try /start in Telegram!")
         
-        # Keep running
+        # Keep running until SIGINT/SIGTERM, without waking the loop while idle
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except NotImplementedError:
+                # Windows: Ctrl+C still raises KeyboardInterrupt
+                pass
+        
         print("\n🤖 Bot is running. Press Ctrl+C to stop.")
-        while True:
-            await asyncio.sleep(1)
+        await stop_event.wait()
+        logger.info("🛑 Bot stopped by user")
             
     except KeyboardInterrupt:
         logger.info("🛑 Bot stopped by user")
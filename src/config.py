@@ -0,0 +1,79 @@
+"""
+Runtime configuration for the Telegram Trading Bot, read once from the environment
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Environment variables the bot cannot run without
+REQUIRED_ENV_VARS = ('TELEGRAM_BOT_TOKEN', 'DATABASE_URL', 'ALPHA_VANTAGE_API_KEY')
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Parse a true/false environment variable"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() == 'true'
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Immutable snapshot of the bot's environment configuration"""
+    
+    # Telegram (credentials are kept out of repr() so the config can be logged)
+    telegram_bot_token: Optional[str] = field(repr=False)
+    telegram_chat_id: Optional[str]
+    # Webhook mode is used instead of polling when webhook_url is set; the
+    # webhook is served by the health check server on ``port``
+    webhook_url: Optional[str]
+    webhook_secret: Optional[str] = field(repr=False)
+    
+    # Storage
+    database_url: Optional[str] = field(repr=False)
+    redis_url: Optional[str] = field(repr=False)
+    
+    # Market data
+    bybit_api_key: Optional[str] = field(repr=False)
+    bybit_secret_key: Optional[str] = field(repr=False)
+    bybit_testnet: bool
+    alpha_vantage_api_key: Optional[str] = field(repr=False)
+    
+    # Runtime
+    log_level: str
+    log_format: str
+    port: int
+    render_service_id: str
+    
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Read every setting from the environment"""
+        return cls(
+            telegram_bot_token=os.getenv('TELEGRAM_BOT_TOKEN'),
+            telegram_chat_id=os.getenv('TELEGRAM_CHAT_ID'),
+            webhook_url=os.getenv('WEBHOOK_URL'),
+            webhook_secret=os.getenv('WEBHOOK_SECRET'),
+            database_url=os.getenv('DATABASE_URL'),
+            redis_url=os.getenv('REDIS_URL'),
+            bybit_api_key=os.getenv('BYBIT_API_KEY'),
+            bybit_secret_key=os.getenv('BYBIT_SECRET_KEY'),
+            bybit_testnet=_env_bool('BYBIT_TESTNET'),
+            alpha_vantage_api_key=os.getenv('ALPHA_VANTAGE_API_KEY'),
+            log_level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+            log_format=os.getenv('LOG_FORMAT', 'text').lower(),
+            port=int(os.getenv('PORT', 8080)),
+            render_service_id=os.getenv('RENDER_SERVICE_ID', 'local')
+        )
+    
+    def missing_required(self) -> List[str]:
+        """Names of required environment variables that are not set"""
+        missing = [name for name in REQUIRED_ENV_VARS if not getattr(self, name.lower())]
+        # Without a secret anyone who finds the URL could push fake updates
+        if self.webhook_url and not self.webhook_secret:
+            missing.append('WEBHOOK_SECRET')
+        return missing
+
+
+# Loaded at import; entry points call load_dotenv() before importing this module
+CFG = Config.from_env()
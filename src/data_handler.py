@@ -3,68 +3,261 @@ Market Data Handler - Multi-source market data collection
 Supports Alpha Vantage (forex), Bybit (crypto), and OANDA (forex)
 """
 
-import os
+import time
+import random
 import asyncio
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Awaitable, Callable
 from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import aiohttp
+import orjson
+from aiolimiter import AsyncLimiter
+
+from config import CFG
 from logger import get_trading_logger
+from database import bulk_insert_market_data
 
 try:
-    from pybit.unified_trading import HTTP as BybitClient
-except ImportError:
-    BybitClient = None
-    
-try:
-    from alpha_vantage.timeseries import TimeSeries
+    import redis.asyncio as aioredis
 except ImportError:
-    TimeSeries = None
+    aioredis = None
 
 logger = get_trading_logger()
 
+BYBIT_URL = 'https://api.bybit.com'
+BYBIT_TESTNET_URL = 'https://api-testnet.bybit.com'
+ALPHA_VANTAGE_URL = 'https://www.alphavantage.co'
+
+# Retry settings for rate-limited responses (seconds / attempts)
+BACKOFF_BASE = 1
+BACKOFF_CAP = 60
+MAX_RETRIES = 5
+BYBIT_RATE_LIMIT_CODE = 10006
+
+# Collection pipeline settings
+COLLECTION_INTERVAL = 300  # 5 minutes between cycles
+FETCH_WORKERS = 16
+FETCH_QUEUE_SIZE = 64
+DB_QUEUE_SIZE = 64
+DB_BATCH_SIZE = 100
+DB_FLUSH_INTERVAL = 5
+
+# Cache settings (seconds / entries). A fetch is reused for the rest of its
+# collection cycle: by the cycle retried after an error, and by a restarted or
+# second instance sharing Redis. The same symbol comes round again at least
+# COLLECTION_INTERVAL later, by which time the entry has expired.
+MARKET_CACHE_TTL = COLLECTION_INTERVAL - 10
+MEMORY_CACHE_SIZE = 1024
+
+ALPHA_VANTAGE_FIELDS = ('1. open', '2. high', '3. low', '4. close', '5. volume')
+
+# API interval -> MarketData.timeframe
+TIMEFRAMES = {
+    '1': '1m', '5': '5m', '15': '15m', '60': '1h', '240': '4h', 'D': '1d',
+    '1min': '1m', '5min': '5m', '15min': '15m', '60min': '1h',
+}
+
+
+def to_market_rows(data: Dict[str, Any]) -> List[tuple]:
+    """Flatten a fetch result into MarketData rows
+    
+    Rows are (symbol, timeframe, timestamp, open, high, low, close, volume),
+    matching database.bulk_insert_market_data.
+    """
+    symbol = data['symbol']
+    timeframe = data['timeframe']
+    
+    if data['source'] == 'bybit':
+        # Bybit klines: [start_ms, open, high, low, close, volume, turnover]
+        return [
+            (
+                symbol, timeframe,
+                datetime.fromtimestamp(int(bar[0]) / 1000, tz=timezone.utc),
+                float(bar[1]), float(bar[2]), float(bar[3]), float(bar[4]), float(bar[5])
+            )
+            for bar in data['data']
+        ]
+    
+    # Alpha Vantage bar times are local to the exchange time zone in the metadata
+    tz_name = next(
+        (v for k, v in data['meta_data'].items() if k.endswith('Time Zone')), 'UTC'
+    )
+    tz = ZoneInfo(tz_name)
+    return [
+        (
+            symbol, timeframe,
+            datetime.fromisoformat(ts).replace(tzinfo=tz),
+            *(float(bar[field]) for field in ALPHA_VANTAGE_FIELDS)
+        )
+        for ts, bar in data['data'].items()
+    ]
+
+
 class MarketDataHandler:
     """Handles market data collection from multiple sources"""
     
     def __init__(self):
         self.running = False
         self.data_sources = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.redis = None
+        self._memory_cache: OrderedDict = OrderedDict()
+        # Task running start_data_collection(), awaited by stop()
+        self._collection_task: Optional[asyncio.Task] = None
+        # (symbol, timeframe) -> (timestamp, hash of OHLCV) of the newest stored bar
+        self._seen: Dict[tuple, tuple] = {}
         self.crypto_pairs = ['BTCUSDT', 'ETHUSDT', 'ADAUSDT', 'DOTUSDT']
         self.forex_pairs = ['EURUSD', 'GBPUSD', 'USDJPY', 'USDCHF', 'AUDUSD', 'USDCAD', 'NZDUSD']
         self.commodities = ['XAUUSD']
         
+        # Bound in-flight requests per source
+        self._bybit_semaphore = asyncio.Semaphore(8)
+        self._alpha_vantage_semaphore = asyncio.Semaphore(1)
+        
+        # Per-source token buckets; Alpha Vantage's free tier allows 5 requests/minute
+        self._limiters = {
+            'bybit': AsyncLimiter(max_rate=50, time_period=1),
+            'alpha_vantage': AsyncLimiter(max_rate=5, time_period=60)
+        }
+        # Monotonic time until which a source has told us to stop sending requests
+        self._paused_until: Dict[str, float] = {}
+        
+        # Symbol -> fetcher dispatch table
+        self._symbol_source: Dict[str, Callable[[str], Awaitable[Optional[Dict[str, Any]]]]] = {
+            s: self.get_crypto_data for s in self.crypto_pairs
+        }
+        self._symbol_source.update(
+            {s: self.get_forex_data for s in self.forex_pairs + self.commodities}
+        )
+        
         self._initialize_clients()
         logger.log_system_event("MarketDataHandler initialized")
     
     def _initialize_clients(self):
-        """Initialize API clients for different data sources"""
+        """Initialize API settings for different data sources"""
         try:
-            # Initialize Bybit client for crypto data
-            bybit_api_key = os.getenv('BYBIT_API_KEY')
-            bybit_secret = os.getenv('BYBIT_SECRET_KEY')
-            
-            if bybit_api_key and bybit_secret and BybitClient:
-                self.data_sources['bybit'] = BybitClient(
-                    api_key=bybit_api_key,
-                    api_secret=bybit_secret,
-                    testnet=os.getenv('BYBIT_TESTNET', 'false').lower() == 'true'
-                )
+            # Configure Bybit for crypto data
+            if CFG.bybit_api_key and CFG.bybit_secret_key:
+                self.data_sources['bybit'] = {
+                    'base_url': BYBIT_TESTNET_URL if CFG.bybit_testnet else BYBIT_URL
+                }
                 logger.log_system_event("Bybit client initialized successfully")
             else:
-                logger.log_system_event("Bybit client not initialized - missing credentials or pybit library")
+                logger.log_system_event("Bybit client not initialized - missing credentials")
             
-            # Initialize Alpha Vantage for forex/commodities
-            alpha_vantage_key = os.getenv('ALPHA_VANTAGE_API_KEY')
-            if alpha_vantage_key and TimeSeries:
-                self.data_sources['alpha_vantage'] = TimeSeries(
-                    key=alpha_vantage_key,
-                    output_format='pandas'
-                )
+            # Configure Alpha Vantage for forex/commodities
+            if CFG.alpha_vantage_api_key:
+                self.data_sources['alpha_vantage'] = {
+                    'base_url': ALPHA_VANTAGE_URL,
+                    'api_key': CFG.alpha_vantage_api_key
+                }
                 logger.log_system_event("Alpha Vantage client initialized successfully")
             else:
-                logger.log_system_event("Alpha Vantage client not initialized - missing credentials or library")
+                logger.log_system_event("Alpha Vantage client not initialized - missing credentials")
+            
+            # Shared Redis cache (optional, second tier behind the in-memory LRU)
+            if CFG.redis_url and aioredis:
+                self.redis = aioredis.from_url(CFG.redis_url)
+                logger.log_system_event("Redis cache initialized successfully")
+            else:
+                logger.log_system_event("Redis cache not initialized - missing REDIS_URL or redis library")
                 
         except Exception as e:
             logger.log_error(e, {"context": "data_source_initialization"})
     
+    async def _ainit(self):
+        """Create the shared HTTP session (must run inside the event loop)"""
+        if self._session is None or self._session.closed:
+            # One keep-alive pool shared by every fetcher, so TLS handshakes
+            # and DNS lookups are paid once per host rather than per request
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=128,
+                    limit_per_host=64,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75
+                )
+            )
+    
+    async def _request_json(self, source: str, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET a JSON payload, respecting the source's rate limit and backing off when throttled"""
+        await self._ainit()
+        
+        for attempt in range(MAX_RETRIES):
+            pause = self._paused_until.get(source, 0) - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            
+            async with self._limiters[source]:
+                async with self._session.get(url, params=params) as r:
+                    if source == 'bybit':
+                        self._update_bybit_limit(r.headers)
+                    if r.status != 429:
+                        r.raise_for_status()
+                        response = await r.json()
+                        if response.get('retCode') != BYBIT_RATE_LIMIT_CODE:
+                            return response
+            
+            # Exponential backoff with jitter
+            delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+            delay = delay / 2 + random.uniform(0, delay / 2)
+            logger.log_system_event(f"Rate limited by {source}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        
+        raise RuntimeError(f"{source} rate limit not cleared after {MAX_RETRIES} attempts")
+    
+    def _update_bybit_limit(self, headers) -> None:
+        """Pause Bybit requests until the window resets once its quota is exhausted"""
+        remaining = headers.get('X-Bapi-Limit-Status')
+        reset_at = headers.get('X-Bapi-Limit-Reset-Timestamp')
+        if remaining is None or reset_at is None or int(remaining) > 0:
+            return
+        
+        wait = int(reset_at) / 1000 - time.time()
+        if wait > 0:
+            self._paused_until['bybit'] = time.monotonic() + wait
+    
+    async def _cached_fetch(self, key: str, ttl: int, fetcher: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached payload from memory or Redis, otherwise fetch and store it"""
+        now = time.monotonic()
+        
+        # Tier 1: in-process LRU
+        entry = self._memory_cache.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._memory_cache.move_to_end(key)
+                return value
+            del self._memory_cache[key]
+        
+        # Tier 2: Redis shared across workers
+        value = None
+        if self.redis is not None:
+            try:
+                cached = await self.redis.get(key)
+                if cached is not None:
+                    value = orjson.loads(cached)
+            except Exception as e:
+                logger.log_error(e, {"context": f"redis_cache_get_{key}"})
+        
+        if value is None:
+            value = await fetcher()
+            if value is None:
+                return None
+            if self.redis is not None:
+                try:
+                    await self.redis.set(key, orjson.dumps(value), ex=ttl)
+                except Exception as e:
+                    logger.log_error(e, {"context": f"redis_cache_set_{key}"})
+        
+        self._memory_cache[key] = (now + ttl, value)
+        if len(self._memory_cache) > MEMORY_CACHE_SIZE:
+            self._memory_cache.popitem(last=False)
+        
+        return value
+    
     async def get_crypto_data(self, symbol: str, interval: str = '1') -> Optional[Dict[str, Any]]:
         """Get cryptocurrency data from Bybit"""
         if 'bybit' not in self.data_sources:
@@ -72,34 +265,52 @@ class MarketDataHandler:
             return None
             
         try:
-            client = self.data_sources['bybit']
-            
-            # Get kline data from Bybit
-            response = client.get_kline(
-                category="spot",
-                symbol=symbol,
-                interval=interval,
-                limit=200
+            klines = await self._cached_fetch(
+                f"shared:market:bybit:{symbol}:{interval}",
+                MARKET_CACHE_TTL,
+                lambda: self._fetch_bybit_klines(symbol, interval)
             )
             
-            if response.get('retCode') == 0:
-                klines = response.get('result', {}).get('list', [])
-                if klines:
-                    logger.log_system_event(f"Retrieved {len(klines)} data points for {symbol}")
-                    return {
-                        'symbol': symbol,
-                        'data': klines,
-                        'timestamp': datetime.now(timezone.utc),
-                        'source': 'bybit'
-                    }
-            else:
-                logger.log_system_event(f"Bybit API error for {symbol}: {response.get('retMsg')}")
+            if klines:
+                return {
+                    'symbol': symbol,
+                    'timeframe': TIMEFRAMES.get(interval, interval),
+                    'data': klines,
+                    'timestamp': datetime.now(timezone.utc),
+                    'source': 'bybit'
+                }
                 
         except Exception as e:
             logger.log_error(e, {"context": f"bybit_data_fetch_{symbol}"})
             
         return None
     
+    async def _fetch_bybit_klines(self, symbol: str, interval: str) -> Optional[List[List[str]]]:
+        """Request kline data from Bybit"""
+        source = self.data_sources['bybit']
+        
+        async with self._bybit_semaphore:
+            response = await self._request_json(
+                'bybit',
+                f"{source['base_url']}/v5/market/kline",
+                {
+                    'category': 'spot',
+                    'symbol': symbol,
+                    'interval': interval,
+                    'limit': 200
+                }
+            )
+        
+        if response.get('retCode') == 0:
+            klines = response.get('result', {}).get('list', [])
+            if klines:
+                logger.log_system_event(f"Retrieved {len(klines)} data points for {symbol}")
+                return klines
+        else:
+            logger.log_system_event(f"Bybit API error for {symbol}: {response.get('retMsg')}")
+        
+        return None
+    
     async def get_forex_data(self, symbol: str, interval: str = '1min') -> Optional[Dict[str, Any]]:
         """Get forex data from Alpha Vantage"""
         if 'alpha_vantage' not in self.data_sources:
@@ -107,21 +318,19 @@ class MarketDataHandler:
             return None
             
         try:
-            client = self.data_sources['alpha_vantage']
-            
-            # Get intraday data from Alpha Vantage
-            data, meta_data = client.get_intraday(
-                symbol=symbol,
-                interval=interval,
-                outputsize='compact'
+            payload = await self._cached_fetch(
+                f"shared:market:alpha_vantage:{symbol}:{interval}",
+                MARKET_CACHE_TTL,
+                lambda: self._fetch_alpha_vantage_series(symbol, interval)
             )
             
-            if not data.empty:
-                logger.log_system_event(f"Retrieved {len(data)} data points for {symbol}")
+            if payload:
                 return {
                     'symbol': symbol,
-                    'data': data,
-                    'meta_data': meta_data,
+                    'timeframe': TIMEFRAMES.get(interval, interval),
+                    # Bar time -> API strings, parsed once in to_market_rows
+                    'data': payload['data'],
+                    'meta_data': payload['meta_data'],
                     'timestamp': datetime.now(timezone.utc),
                     'source': 'alpha_vantage'
                 }
@@ -131,46 +340,169 @@ class MarketDataHandler:
             
         return None
     
+    async def _fetch_alpha_vantage_series(self, symbol: str, interval: str) -> Optional[Dict[str, Any]]:
+        """Request intraday time series from Alpha Vantage"""
+        source = self.data_sources['alpha_vantage']
+        
+        async with self._alpha_vantage_semaphore:
+            response = await self._request_json(
+                'alpha_vantage',
+                f"{source['base_url']}/query",
+                {
+                    'function': 'TIME_SERIES_INTRADAY',
+                    'symbol': symbol,
+                    'interval': interval,
+                    'outputsize': 'compact',
+                    'apikey': source['api_key']
+                }
+            )
+        
+        data = response.get(f'Time Series ({interval})')
+        if data:
+            logger.log_system_event(f"Retrieved {len(data)} data points for {symbol}")
+            return {'data': data, 'meta_data': response.get('Meta Data', {})}
+        
+        error = response.get('Error Message') or response.get('Note') or response.get('Information')
+        logger.log_system_event(f"Alpha Vantage API error for {symbol}: {error}")
+        return None
+    
     async def get_market_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get market data for any supported symbol from appropriate source"""
-        if symbol in self.crypto_pairs:
-            return await self.get_crypto_data(symbol)
-        elif symbol in self.forex_pairs or symbol in self.commodities:
-            return await self.get_forex_data(symbol)
-        else:
+        fetcher = self._symbol_source.get(symbol)
+        if fetcher is None:
             logger.log_system_event(f"Unsupported symbol: {symbol}")
             return None
+        return await fetcher(symbol)
     
     async def start_data_collection(self):
-        """Start collecting market data from all configured sources"""
+        """Start collecting market data from all configured sources
+        
+        A scheduler queues every symbol once per cycle, a pool of workers fetches
+        them concurrently and a single writer bulk-loads the results.
+        """
         self.running = True
         logger.log_system_event("Market data collection started")
         
+        fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=FETCH_QUEUE_SIZE)
+        db_queue: asyncio.Queue = asyncio.Queue(maxsize=DB_QUEUE_SIZE)
+        
+        self._collection_task = asyncio.current_task()
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._schedule_fetches(fetch_queue))
+                for _ in range(FETCH_WORKERS):
+                    tg.create_task(self._fetch_worker(fetch_queue, db_queue))
+                tg.create_task(self._write_market_data(db_queue))
+        finally:
+            self._collection_task = None
+    
+    async def _schedule_fetches(self, fetch_queue: asyncio.Queue):
+        """Queue every supported symbol once per collection cycle"""
         while self.running:
             try:
-                # Collect data for all supported instruments
-                all_symbols = self.crypto_pairs + self.forex_pairs + self.commodities
+                for symbol in self._symbol_source:
+                    await fetch_queue.put(symbol)
                 
-                for symbol in all_symbols:
-                    if not self.running:
-                        break
-                        
-                    data = await self.get_market_data(symbol)
-                    if data:
-                        # Here you would typically store the data or pass it to strategy manager
-                        logger.log_system_event(f"Collected data for {symbol}")
-                    
-                    # Small delay between requests to respect rate limits
-                    await asyncio.sleep(2)
-                
-                # Wait before next collection cycle
-                await asyncio.sleep(300)  # 5 minutes between cycles
+                # Let the cycle drain before waiting for the next one
+                await fetch_queue.join()
+                await asyncio.sleep(COLLECTION_INTERVAL)
                 
             except Exception as e:
                 logger.log_error(e, {"context": "data_collection_cycle"})
                 await asyncio.sleep(60)  # Wait 1 minute before retrying
     
+    async def _fetch_worker(self, fetch_queue: asyncio.Queue, db_queue: asyncio.Queue):
+        """Fetch queued symbols and forward their rows to the writer"""
+        while True:
+            symbol = await fetch_queue.get()
+            try:
+                data = await self.get_market_data(symbol)
+                if data:
+                    rows = self._filter_seen(to_market_rows(data))
+                    if rows:
+                        await db_queue.put(rows)
+                    logger.log_system_event(f"Collected data for {symbol}")
+            except Exception as e:
+                logger.log_error(e, {"context": f"data_collection_fetch_{symbol}"})
+            finally:
+                fetch_queue.task_done()
+    
+    async def _write_market_data(self, db_queue: asyncio.Queue):
+        """Batch collected rows and store them with bulk loads"""
+        rows = []
+        try:
+            while True:
+                try:
+                    rows.extend(await asyncio.wait_for(db_queue.get(), timeout=DB_FLUSH_INTERVAL))
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    if len(rows) < DB_BATCH_SIZE:
+                        continue
+                
+                if rows:
+                    await self._store_rows(rows)
+                    rows = []
+        finally:
+            # Don't drop rows that were collected right before shutdown
+            if rows:
+                await self._store_rows(rows)
+    
+    async def _store_rows(self, rows: List[tuple]):
+        """Persist one batch of market data rows"""
+        try:
+            written = await bulk_insert_market_data(rows)
+            logger.log_system_event(f"Stored {written} new or updated market data rows")
+        except Exception as e:
+            logger.log_error(e, {"context": "market_data_bulk_insert"})
+        else:
+            # Only remember bars once they are safely stored, so a failed batch
+            # is retried on the next poll
+            self._mark_seen(rows)
+    
+    def _filter_seen(self, rows: List[tuple]) -> List[tuple]:
+        """Drop bars that are already stored unchanged
+        
+        A poll returns the full kline window, but normally only the newest bar
+        (still forming) and any bars closed since the last poll differ from
+        what is stored.
+        """
+        fresh = []
+        for row in rows:
+            seen = self._seen.get(row[:2])
+            if (
+                seen is None
+                or row[2] > seen[0]
+                or (row[2] == seen[0] and hash(row[3:]) != seen[1])
+            ):
+                fresh.append(row)
+        return fresh
+    
+    def _mark_seen(self, rows: List[tuple]) -> None:
+        """Record the newest stored bar per (symbol, timeframe)"""
+        for row in rows:
+            key = row[:2]
+            seen = self._seen.get(key)
+            if seen is None or row[2] >= seen[0]:
+                self._seen[key] = (row[2], hash(row[3:]))
+    
     async def stop(self):
         """Stop data collection"""
         self.running = False
+        
+        # Cancel the pipeline once (the orchestrator may already have done so)
+        # and let the writer's final flush finish before closing the clients.
+        # asyncio.wait doesn't cancel the task if stop() itself is cancelled.
+        task = self._collection_task
+        if task is not None:
+            if not task.cancelling():
+                task.cancel()
+            await asyncio.wait({task})
+        
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self.redis is not None:
+            await self.redis.aclose()
+            self.redis = None
         logger.log_system_event("Market data collection stopped")
@@ -2,33 +2,41 @@
 Database models and ORM setup for the Telegram Trading Bot
 """
 
-import os
 import asyncio
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Optional, List, Dict
 from decimal import Decimal
 
 import asyncpg
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy import (
     String, Integer, Float, DateTime, Boolean, Text, 
-    ForeignKey, Index, UniqueConstraint, JSON
+    ForeignKey, Index, UniqueConstraint, JSON, text, select
 )
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine.url import URL, make_url
 import uuid
 
+from config import CFG
 from logger import get_trading_logger
 
 logger = get_trading_logger()
 
 # Database configuration
-DATABASE_URL = os.getenv('DATABASE_URL')
-if DATABASE_URL:
-    if DATABASE_URL.startswith('postgres://'):
-        DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql+asyncpg://', 1)
-    elif DATABASE_URL.startswith('postgresql://') and '+asyncpg' not in DATABASE_URL:
-        DATABASE_URL = DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://', 1)
+DATABASE_URL: Optional[URL] = None
+if CFG.database_url:
+    # Parse the URL properly (credentials may contain 'postgres', '@' etc.)
+    # and force the asyncpg driver so we never end up on a blocking one
+    DATABASE_URL = make_url(CFG.database_url)
+    backend, _, driver = DATABASE_URL.drivername.partition('+')
+    if backend in ('postgres', 'postgresql') and driver != 'asyncpg':
+        DATABASE_URL = DATABASE_URL.set(drivername='postgresql+asyncpg')
+
+def _json_serializer(value) -> str:
+    """Serialize JSON columns with orjson (handles NumPy arrays, datetimes and UUIDs)"""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC).decode()
 
 class Base(DeclarativeBase):
     """Base class for all database models"""
@@ -38,6 +46,9 @@ class Base(DeclarativeBase):
 engine = None
 async_session_factory = None
 
+# Connections opened up front by warm_connection_pool()
+POOL_WARM_SIZE = 10
+
 async def init_database():
     """Initialize database connection and create tables"""
     global engine, async_session_factory
@@ -52,10 +63,23 @@ async def init_database():
         engine = create_async_engine(
             DATABASE_URL,
             echo=False,  # Set to True for SQL debugging
-            pool_size=10,
-            max_overflow=20,
+            pool_size=20,
+            max_overflow=40,
             pool_timeout=30,
             pool_recycle=1800,  # 30 minutes
+            pool_pre_ping=True,
+            connect_args={
+                # Reuse prepared statements for the bot's small repetitive queries
+                'prepared_statement_cache_size': 500,
+                'statement_cache_size': 500,
+                'command_timeout': 10,
+                'server_settings': {
+                    'jit': 'off',  # JIT compilation only slows down short OLTP queries
+                    'application_name': 'telegram-trading-bot',
+                },
+            },
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
         )
         
         # Create session factory
@@ -67,12 +91,53 @@ async def init_database():
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
         
+        await setup_timescaledb()
+        
         logger.log_system_event("Database initialized successfully")
         
     except Exception as e:
         logger.log_error(e, {"context": "database_initialization"})
         raise
 
+async def setup_timescaledb():
+    """Convert market_data to a compressed TimescaleDB hypertable when the extension is available"""
+    try:
+        async with engine.begin() as conn:
+            available = await conn.scalar(text(
+                "SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'"
+            ))
+            if not available:
+                logger.log_system_event("TimescaleDB not available - market_data kept as a regular table")
+                return
+            
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS timescaledb"))
+            
+            is_hypertable = await conn.scalar(text(
+                "SELECT 1 FROM timescaledb_information.hypertables "
+                "WHERE hypertable_name = 'market_data'"
+            ))
+            if is_hypertable:
+                return
+            
+            await conn.execute(text(
+                "SELECT create_hypertable('market_data', 'timestamp', "
+                "chunk_time_interval => INTERVAL '1 day', "
+                "if_not_exists => TRUE, migrate_data => TRUE)"
+            ))
+            await conn.execute(text(
+                "ALTER TABLE market_data SET ("
+                "timescaledb.compress, timescaledb.compress_segmentby = 'symbol,timeframe')"
+            ))
+            await conn.execute(text(
+                "SELECT add_compression_policy('market_data', INTERVAL '7 days', if_not_exists => TRUE)"
+            ))
+        
+        logger.log_system_event("market_data converted to TimescaleDB hypertable")
+        
+    except Exception as e:
+        # Hypertables are an optimization; plain PostgreSQL keeps working without them
+        logger.log_error(e, {"context": "timescaledb_setup"})
+
 async def get_db_session() -> AsyncSession:
     """Get a database session"""
     if async_session_factory is None:
@@ -80,11 +145,107 @@ async def get_db_session() -> AsyncSession:
     
     return async_session_factory()
 
+async def get_session_factory() -> async_sessionmaker:
+    """Get the shared session factory, initializing the database if needed"""
+    if async_session_factory is None:
+        await init_database()
+    
+    return async_session_factory
+
+async def warm_connection_pool(size: int = POOL_WARM_SIZE):
+    """Open ``size`` pooled connections concurrently before the first request
+    
+    Connections checked out at the same time are all opened (connect, auth and
+    server settings), then returned idle to the pool for handlers to reuse.
+    """
+    if engine is None:
+        await init_database()
+    
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    await asyncio.gather(*(ping() for _ in range(size)))
+    logger.log_system_event("Database connection pool warmed", get_pool_stats())
+
+def get_pool_stats() -> Dict[str, int]:
+    """Current connection pool usage, for status reporting"""
+    if engine is None:
+        return {}
+    
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow()
+    }
+
+# Columns written by bulk_insert_market_data (id is generated by the database,
+# indicator columns are left NULL)
+MARKET_DATA_COPY_COLUMNS = (
+    'symbol', 'timeframe', 'timestamp',
+    'open_price', 'high_price', 'low_price', 'close_price', 'volume',
+    'created_at',
+)
+# Value columns compared and refreshed when a stored bar is re-polled
+_OHLCV_COLUMNS = ('open_price', 'high_price', 'low_price', 'close_price', 'volume')
+MARKET_DATA_OHLCV = ', '.join(f"market_data.{c}" for c in _OHLCV_COLUMNS)
+MARKET_DATA_EXCLUDED_OHLCV = ', '.join(f"EXCLUDED.{c}" for c in _OHLCV_COLUMNS)
+MARKET_DATA_UPSERT_SET = ', '.join(f"{c} = EXCLUDED.{c}" for c in _OHLCV_COLUMNS)
+
+async def bulk_insert_market_data(rows: List[tuple]) -> int:
+    """Bulk load OHLCV rows with COPY, updating bars whose values changed
+    
+    Each row is (symbol, timeframe, timestamp, open, high, low, close, volume).
+    Rows are copied into a temporary table and merged with ON CONFLICT DO UPDATE,
+    bypassing the ORM; bars that are already stored unchanged are left alone.
+    Returns the number of rows inserted or updated.
+    """
+    if not rows:
+        return 0
+    
+    # A bar may occur twice in one batch (e.g. two polls before a flush);
+    # ON CONFLICT DO UPDATE can only touch each row once per statement
+    rows = list({row[:3]: row for row in rows}.values())
+    
+    if engine is None:
+        await init_database()
+    
+    created_at = datetime.now(timezone.utc)
+    records = [(*row, created_at) for row in rows]
+    columns = ', '.join(MARKET_DATA_COPY_COLUMNS)
+    
+    async with engine.connect() as conn:
+        raw_conn = await conn.get_raw_connection()
+        driver_conn: asyncpg.Connection = raw_conn.driver_connection
+        
+        async with driver_conn.transaction():
+            # Staging table with just the copied columns: no constraints or
+            # defaults, so COPY does no per-row work beyond parsing
+            await driver_conn.execute(
+                "CREATE TEMP TABLE tmp_market_data ON COMMIT DROP AS "
+                f"SELECT {columns} FROM market_data WITH NO DATA"
+            )
+            await driver_conn.copy_records_to_table(
+                'tmp_market_data', records=records, columns=MARKET_DATA_COPY_COLUMNS
+            )
+            status = await driver_conn.execute(
+                f"INSERT INTO market_data ({columns}) "
+                f"SELECT {columns} FROM tmp_market_data "
+                "ON CONFLICT ON CONSTRAINT uq_market_data DO UPDATE SET "
+                f"{MARKET_DATA_UPSERT_SET} "
+                f"WHERE ({MARKET_DATA_OHLCV}) IS DISTINCT FROM ({MARKET_DATA_EXCLUDED_OHLCV})"
+            )
+    
+    # asyncpg returns the command tag, e.g. "INSERT 0 42"
+    return int(status.split()[-1])
+
 class TradingSignal(Base):
     """Model for storing trading signals"""
     __tablename__ = "trading_signals"
     
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     symbol: Mapped[str] = mapped_column(String(20), nullable=False)
     signal_type: Mapped[str] = mapped_column(String(10), nullable=False)  # BUY/SELL
     strategy_name: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -115,17 +276,25 @@ class TradingSignal(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_trading_signals_symbol', 'symbol'),
+        # Covers "latest signals for symbol X with status Y" as an index-only scan
+        Index(
+            'idx_trading_signals_symbol_status_created', 'symbol', 'status', 'created_at',
+            postgresql_include=['signal_type', 'entry_price', 'stop_loss', 'take_profit']
+        ),
         Index('idx_trading_signals_created_at', 'created_at'),
-        Index('idx_trading_signals_status', 'status'),
+        # Partial index: only the few ACTIVE rows the dispatcher reads
+        Index(
+            'idx_trading_signals_active', 'symbol', 'created_at',
+            postgresql_where=text("status = 'ACTIVE'")
+        ),
     )
 
 class Trade(Base):
     """Model for storing executed trades"""
     __tablename__ = "trades"
     
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    signal_id: Mapped[Optional[str]] = mapped_column(String, ForeignKey('trading_signals.id'), nullable=True)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    signal_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey('trading_signals.id'), nullable=True)
     
     symbol: Mapped[str] = mapped_column(String(20), nullable=False)
     trade_type: Mapped[str] = mapped_column(String(10), nullable=False)  # BUY/SELL
@@ -163,14 +332,19 @@ class Trade(Base):
     __table_args__ = (
         Index('idx_trades_symbol', 'symbol'),
         Index('idx_trades_entered_at', 'entered_at'),
-        Index('idx_trades_status', 'status'),
+        Index('idx_trades_status_symbol_entered', 'status', 'symbol', 'entered_at'),
+        # Partial index: only currently open trades
+        Index(
+            'idx_trades_open', 'symbol', 'entered_at',
+            postgresql_where=text("status = 'OPEN'")
+        ),
     )
 
 class StrategyPerformance(Base):
     """Model for tracking strategy performance metrics"""
     __tablename__ = "strategy_performance"
     
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     strategy_name: Mapped[str] = mapped_column(String(50), nullable=False)
     
     # Time period
@@ -205,7 +379,7 @@ class SystemEvent(Base):
     """Model for tracking system events and adaptations"""
     __tablename__ = "system_events"
     
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     event_type: Mapped[str] = mapped_column(String(50), nullable=False)
     
     # Event details
@@ -231,15 +405,16 @@ class SystemEvent(Base):
     )
 
 class MarketData(Base):
-    """Model for storing historical market data"""
+    """Model for storing historical market data (a TimescaleDB hypertable when available)"""
     __tablename__ = "market_data"
     
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Hypertable unique keys must include the partitioning column, so timestamp is part of the PK
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     symbol: Mapped[str] = mapped_column(String(20), nullable=False)
     timeframe: Mapped[str] = mapped_column(String(5), nullable=False)  # 1m, 5m, 15m, 1h, 4h, 1d
     
     # OHLCV data
-    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
     open_price: Mapped[float] = mapped_column(Float, nullable=False)
     high_price: Mapped[float] = mapped_column(Float, nullable=False)
     low_price: Mapped[float] = mapped_column(Float, nullable=False)
@@ -257,8 +432,11 @@ class MarketData(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_market_data_symbol_timeframe', 'symbol', 'timeframe'),
-        Index('idx_market_data_timestamp', 'timestamp'),
+        # Serves "last N bars for symbol/timeframe" as an index-only scan
+        Index(
+            'idx_market_data_symbol_tf_ts', 'symbol', 'timeframe', text('"timestamp" DESC'),
+            postgresql_include=['open_price', 'high_price', 'low_price', 'close_price', 'volume']
+        ),
         UniqueConstraint('symbol', 'timeframe', 'timestamp', name='uq_market_data'),
     )
 
@@ -266,7 +444,7 @@ class UserInteraction(Base):
     """Model for tracking user interactions with the bot"""
     __tablename__ = "user_interactions"
     
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     user_id: Mapped[str] = mapped_column(String(50), nullable=False)
     interaction_type: Mapped[str] = mapped_column(String(50), nullable=False)
     
@@ -275,8 +453,9 @@ class UserInteraction(Base):
     message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
-    # Context
-    context_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Context; interactions without context are stored as SQL NULL rather
+    # than an encoded JSON 'null'
+    context_data: Mapped[Optional[dict]] = mapped_column(JSON(none_as_null=True), nullable=True)
     
     # Timing
     occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
@@ -4,12 +4,326 @@ Comprehensive logging system for the Telegram Trading Bot
 
 import os
 import sys
+import time
+import struct
+import atexit
+import copy
+import queue
+import threading
+import weakref
 import logging
 import logging.handlers
-from datetime import datetime
 from pathlib import Path
+import orjson
 import structlog
-from typing import Optional
+from typing import List, Optional
+
+from config import CFG
+
+
+# Records from every logger are queued here and written by a single
+# background thread, so logging never blocks the event loop on disk I/O
+_log_queue: queue.Queue = queue.Queue(-1)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Loggers kept out of the main log. Trade events are written to both the
+# main log and trades.log; errors (with tracebacks) only to errors.log
+MAIN_LOG_EXCLUDED = ('errors',)
+
+
+class _ExcludeLoggersFilter(logging.Filter):
+    """Reject records from the dedicated loggers (and their children)"""
+    
+    def __init__(self, names):
+        super().__init__()
+        self.names = tuple(names)
+        self.prefixes = tuple(f"{name}." for name in self.names)
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not (record.name in self.names or record.name.startswith(self.prefixes))
+
+
+# Log files are written through a 64 KiB buffer and flushed periodically
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 0.1  # seconds
+
+# Handlers flushed by the shared flusher thread
+_flush_handlers: "weakref.WeakSet[logging.Handler]" = weakref.WeakSet()
+_flusher: Optional[threading.Thread] = None
+_flusher_lock = threading.Lock()
+
+
+def _flush_periodically(handler: logging.Handler) -> None:
+    """Have the shared daemon thread flush a buffering handler every interval"""
+    global _flusher
+    _flush_handlers.add(handler)
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_all, name="log-flusher", daemon=True)
+            _flusher.start()
+
+
+def _flush_all() -> None:
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        for handler in list(_flush_handlers):
+            handler.flush()
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that buffers writes instead of flushing every record
+    
+    A shared daemon thread flushes all open handlers every LOG_FLUSH_INTERVAL
+    seconds, and close() flushes whatever is left at shutdown. The file size is
+    tracked locally so rollover checks need no tell() on the stream.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self._size = 0
+        super().__init__(*args, **kwargs)
+        _flush_periodically(self)
+    
+    def _open(self):
+        stream = open(self.baseFilename, 'ab', buffering=LOG_BUFFER_SIZE)
+        # Append mode starts at the end of the file
+        self._size = stream.tell()
+        return stream
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding or 'utf-8')
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._size and self._size + len(data) >= self.maxBytes:
+                self.doRollover()
+                # With delay=True doRollover leaves the stream closed
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(data)
+            self._size += len(data)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+# Binary trade records: timestamp (ns), symbol id, action id, price, quantity, pnl
+# (37 bytes each: 8 + 4 + 1 + 3 * 8, unpadded)
+TRADE_RECORD = struct.Struct('<QIBddd')
+
+
+class BinaryTradeHandler(logging.Handler):
+    """Append fixed-width binary trade records to trades.bin
+    
+    Handles records whose ``trade_record`` attribute holds
+    (time_ns, symbol, action, price, quantity, pnl). Records are packed into a
+    preallocated buffer that is written out when full or on flush. Symbol and
+    action names are interned to integer ids, and each new name is appended to
+    the ``trades.bin.names`` sidecar as ``kind<TAB>id<TAB>name``.
+    """
+    
+    def __init__(self, filename: str):
+        super().__init__()
+        self.filename = filename
+        self.names_filename = filename + '.names'
+        self._ids = {'symbol': {}, 'action': {}}
+        self._load_names()
+        self._buffer = bytearray(LOG_BUFFER_SIZE - LOG_BUFFER_SIZE % TRADE_RECORD.size)
+        self._offset = 0
+        self._stream = open(filename, 'ab', buffering=0)
+        self._names_stream = open(self.names_filename, 'a', encoding='utf-8')
+        _flush_periodically(self)
+    
+    def _load_names(self) -> None:
+        """Keep ids stable across restarts by reloading the sidecar"""
+        if not os.path.exists(self.names_filename):
+            return
+        with open(self.names_filename, encoding='utf-8') as f:
+            for line in f:
+                kind, name_id, name = line.rstrip('\n').split('\t', 2)
+                self._ids[kind][name] = int(name_id)
+    
+    def _intern(self, kind: str, name: str) -> int:
+        ids = self._ids[kind]
+        name_id = ids.get(name)
+        if name_id is None:
+            name_id = ids[name] = len(ids)
+            self._names_stream.write(f"{kind}\t{name_id}\t{name}\n")
+            self._names_stream.flush()
+        return name_id
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        return hasattr(record, 'trade_record') and super().filter(record)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            ns, symbol, action, price, quantity, pnl = record.trade_record
+            if self._offset == len(self._buffer):
+                self._write_buffer()
+            TRADE_RECORD.pack_into(
+                self._buffer, self._offset,
+                ns, self._intern('symbol', symbol), self._intern('action', action),
+                _as_float(price), _as_float(quantity), _as_float(pnl)
+            )
+            self._offset += TRADE_RECORD.size
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _write_buffer(self) -> None:
+        if self._offset and self._stream is not None:
+            self._stream.write(memoryview(self._buffer)[:self._offset])
+            self._offset = 0
+    
+    def flush(self) -> None:
+        with self.lock:
+            self._write_buffer()
+    
+    def close(self) -> None:
+        with self.lock:
+            try:
+                self._write_buffer()
+                if self._stream is not None:
+                    self._stream.close()
+                    self._names_stream.close()
+                    self._stream = None
+            finally:
+                super().close()
+
+
+def _as_float(value) -> float:
+    return float('nan') if value is None else float(value)
+
+
+def read_binary_trade_log(filename: str) -> List[dict]:
+    """Decode a trades.bin file (and its names sidecar) for offline analysis"""
+    names = {'symbol': {}, 'action': {}}
+    with open(filename + '.names', encoding='utf-8') as f:
+        for line in f:
+            kind, name_id, name = line.rstrip('\n').split('\t', 2)
+            names[kind][int(name_id)] = name
+    
+    with open(filename, 'rb') as f:
+        data = f.read()
+    
+    return [
+        {
+            'timestamp_ns': ns,
+            'symbol': names['symbol'][symbol_id],
+            'action': names['action'][action_id],
+            'price': price,
+            'quantity': quantity,
+            'pnl': pnl
+        }
+        for ns, symbol_id, action_id, price, quantity, pnl in TRADE_RECORD.iter_unpack(
+            data[:len(data) - len(data) % TRADE_RECORD.size]
+        )
+    ]
+
+
+def _json_dumps(obj, default=None, **kwargs) -> str:
+    """Serialize structlog event dicts with orjson
+    
+    Handles datetimes, NumPy values and non-string keys natively; anything else
+    goes through structlog's ``default`` fallback.
+    """
+    return orjson.dumps(
+        obj,
+        default=default,
+        option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+
+_stack_info_renderer = structlog.processors.StackInfoRenderer()
+
+
+def _render_exc_and_stack(logger, method_name: str, event_dict: dict) -> dict:
+    """Render exc_info / stack_info only for the rare events that carry them
+    
+    Stands in for StackInfoRenderer + format_exc_info, which would otherwise
+    run for every record.
+    """
+    if 'exc_info' in event_dict:
+        event_dict = structlog.processors.format_exc_info(logger, method_name, event_dict)
+    if 'stack_info' in event_dict:
+        event_dict = _stack_info_renderer(logger, method_name, event_dict)
+    return event_dict
+
+
+_json_renderer = structlog.processors.JSONRenderer(serializer=_json_dumps)
+
+
+def _render_event(logger, method_name: str, event_dict: dict):
+    """Render the event as JSON, handing a binary trade record on as an extra
+    
+    Trade events carry ``trade_record`` when LOG_FORMAT=binary; it becomes a
+    LogRecord attribute for BinaryTradeHandler instead of part of the JSON.
+    """
+    trade_record = event_dict.pop('trade_record', None)
+    message = _json_renderer(logger, method_name, event_dict)
+    if trade_record is None:
+        return message
+    return (message,), {'extra': {'trade_record': trade_record}}
+
+
+class _LineFormatter(logging.Formatter):
+    """Formatter that builds each line with a callable instead of a %-template
+    
+    ``line(record, asctime)`` is usually an f-string lambda, which skips the
+    record-dict %-interpolation the stock Formatter does. Tracebacks and stack
+    info are appended exactly as logging.Formatter does.
+    """
+    
+    def __init__(self, line):
+        super().__init__()
+        self._line = line
+    
+    def format(self, record: logging.LogRecord) -> str:
+        record.message = record.getMessage()
+        s = self._line(record, self.formatTime(record, self.datefmt))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            s = f"{s}\n{record.exc_text}"
+        if record.stack_info:
+            s = f"{s}\n{self.formatStack(record.stack_info)}"
+        return s
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves traceback formatting to the listener thread
+    
+    The stock prepare() formats the whole record, traceback included, on the
+    logging thread. Here only the message is interpolated (so later changes to
+    the arguments don't leak in); exc_info and stack_info travel with the
+    record and are rendered by the file handler's formatter.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+def _attach_queue_handler(target: logging.Logger) -> None:
+    """Route a logger's records into the shared log queue"""
+    target.handlers.clear()
+    target.addHandler(_DeferredQueueHandler(_log_queue))
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(_stop_listener)
 
 
 def setup_logging(
@@ -17,32 +331,46 @@ def setup_logging(
     log_dir: str = "logs"
 ) -> structlog.BoundLogger:
     """Setup comprehensive logging configuration"""
+    global _listener
     
     # Create logs directory if it doesn't exist
     Path(log_dir).mkdir(parents=True, exist_ok=True)
     
     # Determine log level
     if log_level is None:
-        log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
-    
-    # Configure standard logging
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            # Console handler
-            logging.StreamHandler(sys.stdout),
-            # File handler with rotation
-            logging.handlers.RotatingFileHandler(
-                filename=os.path.join(log_dir, 'bot.log'),
-                maxBytes=10 * 1024 * 1024,  # 10MB
-                backupCount=5,
-                encoding='utf-8'
-            )
-        ]
+        log_level = CFG.log_level
+    
+    # Restart cleanly if logging is configured more than once
+    _stop_listener()
+    
+    # Configure standard logging; the root logger only enqueues records, the
+    # real handlers run in the listener thread
+    root_formatter = _LineFormatter(
+        lambda r, asctime: f"{asctime} - {r.name} - {r.levelname} - {r.message}"
     )
+    main_only = _ExcludeLoggersFilter(MAIN_LOG_EXCLUDED)
     
-    # Configure structured logging
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    # File handler with rotation
+    file_handler = BufferedRotatingFileHandler(
+        filename=os.path.join(log_dir, 'bot.log'),
+        maxBytes=10 * 1024 * 1024,  # 10MB
+        backupCount=5,
+        encoding='utf-8'
+    )
+    for handler in (console_handler, file_handler):
+        handler.setFormatter(root_formatter)
+        handler.addFilter(main_only)
+        # Trade events arrive through the 'trades' logger, which has its own level
+        handler.setLevel(log_level)
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, log_level))
+    _attach_queue_handler(root_logger)
+    
+    # Configure structured logging; filter_by_level must stay first so dropped
+    # records skip the rest of the chain
     structlog.configure(
         processors=[
             structlog.stdlib.filter_by_level,
@@ -50,10 +378,8 @@ def setup_logging(
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            _render_exc_and_stack,
+            _render_event
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -62,8 +388,16 @@ def setup_logging(
     )
     
     # Create specialized loggers
-    setup_trade_logger(log_dir)
-    setup_error_logger(log_dir)
+    trade_handlers = setup_trade_logger(log_dir)
+    error_handler = setup_error_logger(log_dir)
+    
+    # One background thread serves every handler
+    _listener = logging.handlers.QueueListener(
+        _log_queue,
+        console_handler, file_handler, *trade_handlers, error_handler,
+        respect_handler_level=True
+    )
+    _listener.start()
     
     # Return main logger
     logger = structlog.get_logger("telegram_trading_bot")
@@ -72,184 +406,195 @@ def setup_logging(
     return logger
 
 
-def setup_trade_logger(log_dir: str) -> None:
-    """Setup specialized logger for trade-related events"""
+def setup_trade_logger(log_dir: str) -> List[logging.Handler]:
+    """Setup specialized logger for trade-related events
+    
+    Returns the file handlers, which the queue listener runs. Trade events
+    are also written to the main log. With LOG_FORMAT=binary, signals and
+    executions go to trades.bin while the remaining trade events stay in the
+    text trades.log.
+    """
     trade_logger = logging.getLogger('trades')
     trade_logger.setLevel(logging.INFO)
     
-    # Remove existing handlers to avoid duplication
-    trade_logger.handlers.clear()
+    # Replace existing handlers to avoid duplication
+    _attach_queue_handler(trade_logger)
     
-    # Add file handler for trades
-    trade_handler = logging.handlers.RotatingFileHandler(
+    # File handler for trades
+    trade_handler = BufferedRotatingFileHandler(
         filename=os.path.join(log_dir, 'trades.log'),
         maxBytes=5 * 1024 * 1024,  # 5MB
         backupCount=10,
         encoding='utf-8'
     )
     
-    trade_formatter = logging.Formatter(
-        '%(asctime)s - TRADE - %(levelname)s - %(message)s'
+    trade_formatter = _LineFormatter(
+        lambda r, asctime: f"{asctime} - TRADE - {r.levelname} - {r.message}"
     )
     trade_handler.setFormatter(trade_formatter)
-    trade_logger.addHandler(trade_handler)
+    trade_handler.addFilter(logging.Filter('trades'))
+    trade_handler.addFilter(lambda record: not hasattr(record, 'trade_record'))
+    handlers = [trade_handler]
+    
+    if CFG.log_format == 'binary':
+        handlers.append(BinaryTradeHandler(os.path.join(log_dir, 'trades.bin')))
     
     # Prevent propagation to root logger
     trade_logger.propagate = False
+    
+    return handlers
 
 
-def setup_error_logger(log_dir: str) -> None:
-    """Setup specialized logger for errors and exceptions"""
+def setup_error_logger(log_dir: str) -> logging.Handler:
+    """Setup specialized logger for errors and exceptions
+    
+    Returns the file handler, which the queue listener runs.
+    """
     error_logger = logging.getLogger('errors')
     error_logger.setLevel(logging.ERROR)
     
-    # Remove existing handlers to avoid duplication
-    error_logger.handlers.clear()
+    # Replace existing handlers to avoid duplication
+    _attach_queue_handler(error_logger)
     
-    # Add file handler for errors
-    error_handler = logging.handlers.RotatingFileHandler(
+    # File handler for errors; most runs never log one, so the file is only
+    # opened (and created) when the first error arrives
+    error_handler = BufferedRotatingFileHandler(
         filename=os.path.join(log_dir, 'errors.log'),
         maxBytes=5 * 1024 * 1024,  # 5MB
         backupCount=10,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True
     )
+    error_handler.setLevel(logging.ERROR)
     
-    error_formatter = logging.Formatter(
-        '%(asctime)s - ERROR - %(name)s - %(levelname)s - %(message)s\n'
-        'Exception: %(exc_info)s\n'
-        '%(pathname)s:%(lineno)d in %(funcName)s\n'
-        '----------------------------------------'
+    error_formatter = _LineFormatter(
+        lambda r, asctime: (
+            f"{asctime} - ERROR - {r.name} - {r.levelname} - {r.message}\n"
+            f"Exception: {r.exc_info}\n"
+            f"{r.pathname}:{r.lineno} in {r.funcName}\n"
+            "----------------------------------------"
+        )
     )
     error_handler.setFormatter(error_formatter)
-    error_logger.addHandler(error_handler)
+    error_handler.addFilter(logging.Filter('errors'))
     
     # Prevent propagation to root logger
     error_logger.propagate = False
+    
+    return error_handler
 
 
 class TradingLogger:
-    """Specialized logger for trading operations"""
+    """Specialized logger for trading operations
+    
+    Trade events are emitted once, as structlog events on the 'trades'
+    logger; the queue listener writes them to both the main log and
+    trades.log. Every method checks the level first, so disabled levels skip
+    field collection entirely. The checks stay live (the stdlib caches them
+    per logger) because instances are usually created at import time, before
+    setup_logging() has set any levels.
+    """
+    
+    __slots__ = (
+        'main_logger', 'trade_events', 'error_logger',
+        '_main_stdlib', '_trade_stdlib', '_binary_trades'
+    )
     
     def __init__(self):
         self.main_logger = structlog.get_logger("telegram_trading_bot")
-        self.trade_logger = logging.getLogger('trades')
+        self.trade_events = structlog.get_logger('trades')
         self.error_logger = logging.getLogger('errors')
+        # Stdlib loggers behind the structlog ones, used for the level checks
+        self._main_stdlib = logging.getLogger("telegram_trading_bot")
+        self._trade_stdlib = logging.getLogger('trades')
+        self._binary_trades = CFG.log_format == 'binary'
     
     def log_signal(self, symbol: str, signal_type: str, details: dict):
         """Log trading signal generation"""
-        self.trade_logger.info(
-            f"SIGNAL_GENERATED - {symbol} - {signal_type}",
-            extra={
-                'symbol': symbol,
-                'signal_type': signal_type,
-                'details': details,
-                'timestamp': datetime.utcnow().isoformat()
-            }
-        )
+        if not self._trade_stdlib.isEnabledFor(logging.INFO):
+            return
         
-        self.main_logger.info(
+        entry_price = details.get('entry_price')
+        self.trade_events.info(
             "Trading signal generated",
             symbol=symbol,
             signal_type=signal_type,
             confluence_score=details.get('confluence_score', 0),
-            entry_price=details.get('entry_price'),
+            entry_price=entry_price,
             stop_loss=details.get('stop_loss'),
-            take_profit=details.get('take_profit')
+            take_profit=details.get('take_profit'),
+            trade_record=(
+                time.time_ns(), symbol, f"SIGNAL_{signal_type}", entry_price, None, None
+            ) if self._binary_trades else None
         )
     
     def log_trade_execution(self, symbol: str, action: str, details: dict):
         """Log trade execution"""
-        self.trade_logger.info(
-            f"TRADE_EXECUTED - {symbol} - {action}",
-            extra={
-                'symbol': symbol,
-                'action': action,
-                'details': details,
-                'timestamp': datetime.utcnow().isoformat()
-            }
-        )
+        if not self._trade_stdlib.isEnabledFor(logging.INFO):
+            return
         
-        self.main_logger.info(
+        price = details.get('price')
+        quantity = details.get('quantity')
+        pnl = details.get('pnl')
+        self.trade_events.info(
             "Trade executed",
             symbol=symbol,
             action=action,
-            price=details.get('price'),
-            quantity=details.get('quantity'),
-            pnl=details.get('pnl')
+            price=price,
+            quantity=quantity,
+            pnl=pnl,
+            trade_record=(
+                time.time_ns(), symbol, action, price, quantity, pnl
+            ) if self._binary_trades else None
         )
     
     def log_strategy_adaptation(self, old_strategy: str, new_strategy: str, reason: str):
         """Log strategy adaptation events"""
-        self.trade_logger.warning(
-            f"STRATEGY_ADAPTED - {old_strategy} -> {new_strategy}",
-            extra={
-                'old_strategy': old_strategy,
-                'new_strategy': new_strategy,
-                'reason': reason,
-                'timestamp': datetime.utcnow().isoformat()
-            }
-        )
-        
-        self.main_logger.warning(
-            "Strategy adapted",
-            old_strategy=old_strategy,
-            new_strategy=new_strategy,
-            reason=reason
-        )
+        if self._trade_stdlib.isEnabledFor(logging.WARNING):
+            self.trade_events.warning(
+                "Strategy adapted",
+                old_strategy=old_strategy,
+                new_strategy=new_strategy,
+                reason=reason
+            )
     
     def log_performance(self, metrics: dict):
         """Log performance metrics"""
-        self.trade_logger.info(
-            "PERFORMANCE_UPDATE",
-            extra={
-                'metrics': metrics,
-                'timestamp': datetime.utcnow().isoformat()
-            }
-        )
-        
-        self.main_logger.info(
-            "Performance metrics updated",
-            **metrics
-        )
+        if self._trade_stdlib.isEnabledFor(logging.INFO):
+            self.trade_events.info(
+                "Performance metrics updated",
+                **metrics
+            )
     
     def log_error(self, error: Exception, context: dict = None):
         """Log errors with context"""
-        context = context or {}
+        if self.error_logger.isEnabledFor(logging.ERROR):
+            self.error_logger.error("Error occurred: %s", error, exc_info=True)
         
-        self.error_logger.error(
-            f"Error occurred: {str(error)}",
-            extra={
-                'error_type': type(error).__name__,
-                'error_message': str(error),
-                'context': context,
-                'timestamp': datetime.utcnow().isoformat()
-            },
-            exc_info=True
-        )
-        
-        self.main_logger.error(
-            "Error occurred",
-            error_type=type(error).__name__,
-            error_message=str(error),
-            **context
-        )
+        if self._main_stdlib.isEnabledFor(logging.ERROR):
+            self.main_logger.error(
+                "Error occurred",
+                error_type=type(error).__name__,
+                error_message=str(error),
+                **(context or {})
+            )
     
     def log_system_event(self, event: str, details: dict = None):
         """Log system-level events"""
-        details = details or {}
+        # Hottest entry point: bail out before touching structlog at all
+        if not self._main_stdlib.isEnabledFor(logging.INFO):
+            return
         
-        self.main_logger.info(
-            event,
-            **details
-        )
+        if details:
+            self.main_logger.info(event, **details)
+        else:
+            self.main_logger.info(event)
+
 
+# Built once at import, so concurrent importers all share the same instance
+_TRADING_LOGGER = TradingLogger()
 
-# Global trading logger instance
-trading_logger = None
 
 def get_trading_logger() -> TradingLogger:
     """Get the global trading logger instance"""
-    global trading_logger
-    if trading_logger is None:
-        trading_logger = TradingLogger()
-    return trading_logger
+    return _TRADING_LOGGER
@@ -14,16 +14,27 @@ class ReportingSystem:
     
     def __init__(self):
         self.running = False
+        self._stop_event = asyncio.Event()
         logger.log_system_event("ReportingSystem initialized")
     
     async def start_daily_reports(self):
         """Start daily reporting scheduler"""
         self.running = True
+        self._stop_event.clear()
         logger.log_system_event("Daily reporting started")
         
         while self.running:
             # Implementation would generate and send daily reports
-            await asyncio.sleep(3600)  # Check every hour for scheduled reports
+            if await self._wait_for_stop(3600):  # Check every hour for scheduled reports
+                break
+    
+    async def _wait_for_stop(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; returns True as soon as stop() is called"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
     
     async def get_performance_summary(self) -> Dict:
         """Get performance summary data"""
@@ -37,4 +48,5 @@ class ReportingSystem:
     async def stop(self):
         """Stop reporting system"""
         self.running = False
+        self._stop_event.set()
         logger.log_system_event("Reporting system stopped")
@@ -4,45 +4,83 @@ This file provides a foundation for adaptive trading strategies
 """
 
 import asyncio
+import time
 from typing import Dict, List, Optional
-from datetime import datetime, timezone, time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
 from logger import get_trading_logger
 
 logger = get_trading_logger()
 
+# Minimum gap between demo signals, in seconds of monotonic time
+SIGNAL_COOLDOWN = 3600
+
+# Session membership as bitmasks over the UTC hour (bit h = hour h):
+# London 8:00-17:00, New York 13:00-22:00, overlap (best time) 13:00-17:00
+LONDON_SESSION_MASK = 0x01FF00   # bits 8..16
+NY_SESSION_MASK = 0x3FE000       # bits 13..21
+ACTIVE_SESSION_MASK = LONDON_SESSION_MASK | NY_SESSION_MASK    # 0x3FFF00, bits 8..21
+OVERLAP_SESSION_MASK = LONDON_SESSION_MASK & NY_SESSION_MASK   # 0x1E000, bits 13..16
+# Session per UTC hour: 0=none, 1=London, 2=New York, 3=overlap
+SESSION_BY_HOUR = tuple(
+    ((LONDON_SESSION_MASK >> h) & 1) | (((NY_SESSION_MASK >> h) & 1) << 1)
+    for h in range(24)
+)
+SESSION_NAMES = (
+    None,
+    "In London session",
+    "In New York session",
+    "In London/NY overlap session (best trading time)"
+)
+
+# Demo signal draws are taken from pre-generated batches
+_rng = np.random.default_rng()
+RANDOM_BATCH_SIZE = 256
+SIGNAL_SIDES = ("BUY", "SELL")
+
 class StrategyManager:
     """Manages multiple trading strategies with adaptive learning"""
     
+    __slots__ = (
+        'running', 'active_strategy', 'last_signal_time', '_last_signal_mono',
+        'signals_today', 'max_daily_signals',
+        '_prev_session', '_stop_event', '_score_buf', '_side_buf', '_random_idx'
+    )
+    
     def __init__(self):
         self.running = False
         self.active_strategy = "multi_confluence"
         self.last_signal_time = None
+        # Monotonic clock reading of the last signal, for the cooldown check
+        self._last_signal_mono: Optional[float] = None
         self.signals_today = 0
         self.max_daily_signals = 3
+        self._prev_session = -1
+        self._stop_event = asyncio.Event()
+        self._refill_random()
         logger.log_system_event("StrategyManager initialized")
     
+    def _refill_random(self):
+        """Draw a fresh batch of demo confluence scores and trade sides"""
+        self._score_buf = _rng.uniform(70, 95, size=RANDOM_BATCH_SIZE).tolist()
+        self._side_buf = _rng.integers(0, 2, size=RANDOM_BATCH_SIZE).tolist()
+        self._random_idx = 0
+    
     def is_trading_session_active(self) -> bool:
         """Check if we're in London (8-17 UTC) or New York (13-22 UTC) sessions"""
         current_hour = datetime.now(timezone.utc).hour
         
-        # London session: 8:00-17:00 UTC
-        london_session = 8 <= current_hour < 17
-        
-        # New York session: 13:00-22:00 UTC  
-        ny_session = 13 <= current_hour < 22
+        # Only log on session transitions, not on every check
+        session = SESSION_BY_HOUR[current_hour]
+        if session != self._prev_session:
+            self._prev_session = session
+            session_name = SESSION_NAMES[session]
+            if session_name:
+                logger.log_system_event(session_name)
         
-        # Overlap (best time): 13:00-17:00 UTC
-        overlap_session = 13 <= current_hour < 17
-        
-        if overlap_session:
-            logger.log_system_event("In London/NY overlap session (best trading time)")
-            return True
-        elif london_session or ny_session:
-            session_name = "London" if london_session else "New York"
-            logger.log_system_event(f"In {session_name} session")
-            return True
-        else:
-            return False
+        return bool((ACTIVE_SESSION_MASK >> current_hour) & 1)
     
     async def generate_signal(self, symbol: str, market_data: dict) -> Optional[dict]:
         """Generate trading signal based on market data"""
@@ -52,11 +90,14 @@ class StrategyManager:
             return None
             
         # Simple demo signal logic (replace with real analysis)
-        import random
-        confluence_score = random.uniform(70, 95)  # Demo confluence
+        if self._random_idx >= RANDOM_BATCH_SIZE:
+            self._refill_random()
+        i = self._random_idx
+        self._random_idx += 1
+        confluence_score = self._score_buf[i]  # Demo confluence
         
         if confluence_score >= 70:  # Minimum threshold
-            signal_type = random.choice(["BUY", "SELL"])
+            signal_type = SIGNAL_SIDES[self._side_buf[i]]
             entry_price = market_data.get('current_price', 1.0000)
             
             # Calculate SL and TP (demo values)
@@ -81,6 +122,7 @@ class StrategyManager:
             
             self.signals_today += 1
             self.last_signal_time = datetime.now(timezone.utc)
+            self._last_signal_mono = time.monotonic()
             
             logger.log_system_event(f"Signal generated for {symbol}", {
                 'type': signal_type,
@@ -92,9 +134,41 @@ class StrategyManager:
         
         return None
     
+    def _next_wakeup(self, now: datetime) -> float:
+        """Seconds until the monitoring loop next has anything to do"""
+        this_hour = now.replace(minute=0, second=0, microsecond=0)
+        active = (ACTIVE_SESSION_MASK >> now.hour) & 1
+        
+        # Next hour at which the session turns on or off
+        next_boundary = next(
+            this_hour + timedelta(hours=offset)
+            for offset in range(1, 25)
+            if (ACTIVE_SESSION_MASK >> ((now.hour + offset) % 24)) & 1 != active
+        )
+        deadlines = [next_boundary, this_hour.replace(hour=0) + timedelta(days=1)]
+        
+        wakeup = (min(deadlines) - now).total_seconds()
+        
+        # Cooldown expiry only matters in session, and only if still ahead of us
+        if active and self._last_signal_mono is not None:
+            cooldown_left = SIGNAL_COOLDOWN - (time.monotonic() - self._last_signal_mono)
+            if cooldown_left > 0:
+                wakeup = min(wakeup, cooldown_left)
+        
+        return wakeup
+    
+    async def _wait_for_stop(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; returns True as soon as stop() is called"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
     async def start_monitoring(self):
         """Start strategy monitoring and signal generation"""
         self.running = True
+        self._stop_event.clear()
         logger.log_system_event("Strategy monitoring started")
         
         while self.running:
@@ -109,8 +183,8 @@ class StrategyManager:
                 # Check if in active trading session
                 if self.is_trading_session_active():
                     # Demo: Generate signal for EURUSD every hour during active sessions
-                    if (not self.last_signal_time or 
-                        (current_time - self.last_signal_time).total_seconds() > 3600):
+                    if (self._last_signal_mono is None or 
+                        time.monotonic() - self._last_signal_mono > SIGNAL_COOLDOWN):
                         
                         # Mock market data (replace with real data from MarketDataHandler)
                         market_data = {'current_price': 1.0950}  # Demo EURUSD price
@@ -120,13 +194,18 @@ class StrategyManager:
                             # Signal generated - telegram handler will send it
                             pass
                 
-                await asyncio.sleep(300)  # Check every 5 minutes
+                # Sleep until something can change: a session boundary, the
+                # signal cooldown expiring or the daily reset at midnight
+                if await self._wait_for_stop(max(1, self._next_wakeup(datetime.now(timezone.utc)))):
+                    break
                 
             except Exception as e:
                 logger.log_error(e, {"context": "strategy_monitoring"}) 
-                await asyncio.sleep(60)
+                if await self._wait_for_stop(60):
+                    break
     
     async def stop(self):
         """Stop strategy monitoring"""
         self.running = False
+        self._stop_event.set()
         logger.log_system_event("Strategy monitoring stopped")
@@ -2,49 +2,233 @@
 Telegram Bot Handler for Trading Signals
 """
 
-import os
 import asyncio
+import time
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 import html
-import json
+import hmac
 
+from sqlalchemy import text
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application, CommandHandler, CallbackQueryHandler, 
     MessageHandler, filters, ContextTypes
 )
 from telegram.constants import ParseMode
+from telegram.error import RetryAfter
+from telegram.request import HTTPXRequest
 
+from config import CFG
 from logger import get_trading_logger
-from database import get_db_session, TradingSignal, Trade, UserInteraction
+from database import (
+    get_db_session, warm_connection_pool, get_pool_stats,
+    TradingSignal, Trade, UserInteraction
+)
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    TELEGRAM_HTTP_VERSION = "2"
+except ImportError:
+    TELEGRAM_HTTP_VERSION = "1.1"
 
 logger = get_trading_logger()
 
+# Telegram allows roughly 30 messages per second per bot across all chats;
+# stay a little below it so bursts rarely trigger flood control
+SEND_CONCURRENCY = 25
+MAX_SEND_RETRIES = 3
+SEND_BACKOFF_BASE = 1  # seconds, doubled on each repeated flood-control retry
+
+# The bot only handles commands, text messages and inline keyboard presses
+ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
+# Updates handled at the same time, so one slow handler (database, strategy)
+# doesn't hold up replies to other users
+CONCURRENT_UPDATES = 256
+
+# Seconds a /status snapshot is reused, so repeated commands share one check
+STATUS_CACHE_TTL = 5
+
+# Upper bound, in seconds, for each /status subsystem check
+STATUS_PROBE_TIMEOUT = 2.0
+
+# Connections kept open to the Bot API, enough for every concurrent update
+# to reply without waiting for a free socket
+BOT_CONNECTION_POOL_SIZE = 256
+
+# Seconds Telegram holds a getUpdates request open while no update arrives.
+# PTB adds this to the HTTP read timeout of the polling request, so the long
+# wait doesn't surface as a TimedOut error.
+POLL_TIMEOUT = 30
+
+# User interactions are queued by the handlers and written in batches
+INTERACTION_QUEUE_SIZE = 10000
+INTERACTION_BATCH_SIZE = 200
+INTERACTION_FLUSH_INTERVAL = 0.25  # seconds
+MAX_LOGGED_TEXT = 256  # characters of a user's text message that are stored
+
+# Static replies, built once. All are MarkdownV2 except PERFORMANCE_MESSAGE
+# (legacy Markdown) and ECHO_MESSAGE (plain text, no parse mode).
+START_MESSAGE = (
+    "🎯 **Welcome to Trading Signal Bot**\\n\\n"
+    "This bot provides professional trading signals for:\\n"
+    "• 💱 Major Forex pairs\\n"
+    "• 🏆 Gold (XAUUSD)\\n"  
+    "• ₿ Major cryptocurrencies\\n\\n"
+    "**Target:** 50-80 pips daily profit\\n"
+    "**Strategy:** Multi-confluence technical analysis\\n"
+    "**Features:** Adaptive learning & performance tracking\\n\\n"
+    "Use /help to see all available commands"
+)
+
+HELP_MESSAGE = (
+    "🤖 **Available Commands**\\n\\n"
+    "📊 **Trading & Signals**\\n"
+    "• `/signals` - View recent signals\\n"
+    "• `/trades` - View trade history\\n"
+    "• `/performance` - Performance metrics\\n\\n"
+    "⚙️ **Bot Management**\\n"  
+    "• `/status` - Bot status & health\\n"
+    "• `/settings` - Bot configuration\\n\\n"
+    "🔄 **Reports**\\n"
+    "• Daily reports sent automatically at 8:00 UTC\\n"
+    "• Weekly reports sent on Sundays\\n"
+    "• `/generate` \- Force generate signal (if in trading session)\\n\\n"
+    "🕰 **Trading Sessions:**\\n"
+    "• London: 08:00\-17:00 UTC\\n"
+    "• New York: 13:00\-22:00 UTC\\n"
+    "• Best: 13:00\-17:00 UTC \(Overlap\)"
+)
+
+PERFORMANCE_MESSAGE = (
+    "📊 *Performance Summary*\n\n"
+    "*Today:*\n"
+    "• Signals: 0\n"
+    "• Trades: 0\n"
+    "• P&L: +0.0 pips\n\n"
+    "*This Week:*\n"
+    "• Signals: 0\n"
+    "• Win Rate: 0.0%\n"
+    "• Total P&L: +0.0 pips\n\n"
+    "*Trading Sessions:*\n"
+    "• London: 08:00-17:00 UTC\n"
+    "• New York: 13:00-22:00 UTC\n"
+    "• Best Time: 13:00-17:00 UTC (Overlap)"
+)
+
+SIGNALS_MESSAGE = (
+    "📡 **Recent Signals**\\n\\n"
+    "🔍 No recent signals found\\n"
+    "Next analysis in progress\\.\\.\\."
+)
+
+TRADES_MESSAGE = (
+    "💼 **Recent Trades**\\n\\n"
+    "No recent trades to display"
+)
+
+ECHO_MESSAGE = "I received your message. Use /help to see available commands."
+
+SETTINGS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔔 Notifications", callback_data="settings_notifications")],
+    [InlineKeyboardButton("📊 Risk Management", callback_data="settings_risk")],
+    [InlineKeyboardButton("🎯 Target Pairs", callback_data="settings_pairs")],
+    [InlineKeyboardButton("📈 Strategy", callback_data="settings_strategy")]
+])
+
+# Trade confirmation buttons under each signal: (label, callback_data prefix),
+# the signal id is appended to the prefix
+SIGNAL_BUTTONS = (
+    (("✅ Trade Taken", "trade_taken_"), ("❌ Trade Skipped", "trade_skipped_")),
+)
+
+SETTINGS_INFO = {
+    "notifications": "🔔 Notifications are currently enabled\\nDaily reports: 8:00 UTC\\nWeekly reports: Sunday 10:00 UTC",
+    "risk": "📊 Current Risk Settings\\nMax risk per trade: 2%\\nDaily trade limit: 3\\nStop loss: 30 pips",
+    "pairs": "🎯 Monitored Pairs\\nForex: EURUSD, GBPUSD, USDJPY\\nCommodity: XAUUSD\\nCrypto: BTCUSDT, ETHUSDT",
+    "strategy": "📈 Active Strategy: Multi-Confluence\\nAdaptive learning enabled\\nConfluence threshold: 70%"
+}
+
+
+# MarkdownV2 reserved characters, escaped in values interpolated into messages
+_MDV2_TRANS = str.maketrans({c: "\\" + c for c in r"_*[]()~`>#+-=|{}.!\\"})
+
+def _md(value) -> str:
+    """Escape a value for interpolation into a MarkdownV2 message"""
+    return str(value).translate(_MDV2_TRANS)
+
+# Minute (since the epoch) and text of the last _utc_hhmm() result
+_utc_minute = -1
+_utc_minute_text = ""
+
+def _utc_hhmm() -> str:
+    """Current UTC time as 'HH:MM UTC', formatted at most once per minute"""
+    global _utc_minute, _utc_minute_text
+    minute = int(time.time() // 60)
+    if minute != _utc_minute:
+        _utc_minute_text = time.strftime('%H:%M UTC', time.gmtime(minute * 60))
+        _utc_minute = minute
+    return _utc_minute_text
+
+
 class TelegramBot:
     """Main Telegram bot handler"""
     
-    def __init__(self, market_data=None, strategy_manager=None, reporting=None):
-        self.token = os.getenv('TELEGRAM_BOT_TOKEN')
-        self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
+    def __init__(self, market_data=None, strategy_manager=None, reporting=None, session_factory=None):
+        self.token = CFG.telegram_bot_token
+        self.chat_id = CFG.telegram_chat_id
         
         if not self.token:
             raise ValueError("TELEGRAM_BOT_TOKEN environment variable not set")
+        if CFG.webhook_url and not CFG.webhook_secret:
+            raise ValueError("WEBHOOK_SECRET environment variable must be set when WEBHOOK_URL is")
         
         self.market_data = market_data
         self.strategy_manager = strategy_manager
         self.reporting = reporting
+        # Shared async_sessionmaker; sessions draw on one warm connection pool
+        self._session_factory = session_factory
         
         self.application = None
-        self.running = False
+        self._stop_event = asyncio.Event()
+        self._send_semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+        self._interaction_queue: asyncio.Queue = asyncio.Queue(maxsize=INTERACTION_QUEUE_SIZE)
+        self._interaction_writer: Optional[asyncio.Task] = None
+        # key -> (monotonic expiry, value) for _cached(), with one lock per key
+        self._reply_cache: Dict[str, tuple] = {}
+        self._reply_cache_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        
+        # Callback data prefix (before the first "_") -> handler
+        self._callback_handlers: Dict[str, Callable[[Any, str], Awaitable[None]]] = {
+            "settings": self._handle_settings_callback,
+            "trade": self._handle_trade_callback
+        }
     
     async def start(self):
         """Start the Telegram bot"""
+        # Cleared before the first await so a stop() issued while starting up
+        # is not lost
+        self._stop_event.clear()
         try:
             logger.log_system_event("Starting Telegram bot")
             
             # Create application
-            self.application = Application.builder().token(self.token).build()
+            # Keep-alive connections, multiplexed over HTTP/2 when h2 is installed;
+            # getUpdates gets its own single connection
+            self.application = (
+                Application.builder()
+                .token(self.token)
+                .concurrent_updates(CONCURRENT_UPDATES)
+                .request(HTTPXRequest(
+                    connection_pool_size=BOT_CONNECTION_POOL_SIZE,
+                    connect_timeout=10.0,
+                    http_version=TELEGRAM_HTTP_VERSION
+                ))
+                .get_updates_request(HTTPXRequest(http_version=TELEGRAM_HTTP_VERSION))
+                .build()
+            )
             
             # Add handlers
             await self._setup_handlers()
@@ -52,10 +236,40 @@ class TelegramBot:
             # Initialize and start
             await self.application.initialize()
             await self.application.start()
+            self._interaction_writer = asyncio.create_task(self._write_interactions())
             
-            # Start polling
-            await self.application.updater.start_polling()
-            self.running = True
+            # Open pooled connections now rather than on the first commands
+            try:
+                await warm_connection_pool()
+            except Exception as e:
+                logger.log_error(e, {"context": "connection_pool_warmup"})
+            
+            # Receive updates: pushed by Telegram when a webhook is configured,
+            # fetched by polling otherwise
+            if CFG.webhook_url:
+                # Updates arrive through the health check server (see
+                # process_webhook_update); only register the URL here
+                await self.application.bot.set_webhook(
+                    url=CFG.webhook_url,
+                    secret_token=CFG.webhook_secret,
+                    allowed_updates=ALLOWED_UPDATES,
+                    drop_pending_updates=True
+                )
+                logger.log_system_event("Telegram webhook registered")
+            else:
+                await self.application.updater.start_polling(
+                    timeout=POLL_TIMEOUT,
+                    bootstrap_retries=-1,
+                    allowed_updates=ALLOWED_UPDATES,
+                    drop_pending_updates=True
+                )
+            
+            # stop() was called while starting up; shut down whatever it missed
+            if self._stop_event.is_set():
+                if self.application.updater.running:
+                    await self.application.updater.stop()
+                await self.stop()
+                return
             
             logger.log_system_event("Telegram bot started successfully")
             
@@ -78,9 +292,8 @@ class TelegramBot:
                 except Exception as e:
                     logger.log_error(e, {"context": "startup_message"})
             
-            # Keep running
-            while self.running:
-                await asyncio.sleep(1)
+            # Keep running until stop() is called
+            await self._stop_event.wait()
                 
         except Exception as e:
             logger.log_error(e, {"context": "telegram_bot_start"})
@@ -88,16 +301,49 @@ class TelegramBot:
     
     async def stop(self):
         """Stop the Telegram bot"""
-        if self.running and self.application:
+        # Application and Updater track their own lifecycle, so there is no
+        # separate running flag to keep in sync
+        self._stop_event.set()
+        if self.application is not None and self.application.running:
             logger.log_system_event("Stopping Telegram bot")
             
-            self.running = False
-            await self.application.updater.stop()
+            if self.application.updater.running:
+                await self.application.updater.stop()
             await self.application.stop()
             await self.application.shutdown()
             
+            # The writer flushes whatever is still queued when it is cancelled
+            writer = self._interaction_writer
+            if writer is not None:
+                writer.cancel()
+                try:
+                    await writer
+                except asyncio.CancelledError:
+                    # Only swallow the writer's own cancellation, not one aimed
+                    # at stop() itself
+                    if not writer.cancelled() or asyncio.current_task().cancelling():
+                        raise
+                self._interaction_writer = None
+            
             logger.log_system_event("Telegram bot stopped")
     
+    def webhook_secret_matches(self, secret_token: Optional[str]) -> bool:
+        """Check the X-Telegram-Bot-Api-Secret-Token header of a webhook request"""
+        if not CFG.webhook_secret:
+            return False
+        return hmac.compare_digest(secret_token or "", CFG.webhook_secret)
+    
+    async def process_webhook_update(self, data: Dict[str, Any]) -> bool:
+        """Queue an update pushed to the webhook for the Application's dispatcher
+        
+        Returns False while the Application isn't running, so the caller can
+        ask Telegram to redeliver.
+        """
+        if self.application is None or not self.application.running:
+            return False
+        await self.application.update_queue.put(Update.de_json(data, self.application.bot))
+        return True
+    
     async def _setup_handlers(self):
         """Setup all command and callback handlers"""
         
@@ -119,73 +365,54 @@ class TelegramBot:
             MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message)
         )
         
+        # Handlers run as concurrent tasks, so failures are reported here
+        self.application.add_error_handler(self._handle_error)
+        
         logger.log_system_event("Telegram bot handlers setup complete")
     
+    async def _handle_error(self, update: object, context: ContextTypes.DEFAULT_TYPE):
+        """Log exceptions raised while processing an update"""
+        logger.log_error(context.error, {
+            "context": "telegram_update",
+            "update_id": getattr(update, 'update_id', None)
+        })
+    
     async def _cmd_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
-        await self._log_interaction(update, "start_command")
-        
-        welcome_message = (
-            "🎯 **Welcome to Trading Signal Bot**\\n\\n"
-            "This bot provides professional trading signals for:\\n"
-            "• 💱 Major Forex pairs\\n"
-            "• 🏆 Gold (XAUUSD)\\n"  
-            "• ₿ Major cryptocurrencies\\n\\n"
-            "**Target:** 50-80 pips daily profit\\n"
-            "**Strategy:** Multi-confluence technical analysis\\n"
-            "**Features:** Adaptive learning & performance tracking\\n\\n"
-            "Use /help to see all available commands"
-        )
+        self._log_interaction(update, "start_command")
         
         await update.message.reply_text(
-            welcome_message,
+            START_MESSAGE,
             parse_mode=ParseMode.MARKDOWN_V2
         )
     
     async def _cmd_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
-        await self._log_interaction(update, "help_command")
-        
-        help_message = (
-            "🤖 **Available Commands**\\n\\n"
-            "📊 **Trading & Signals**\\n"
-            "• `/signals` - View recent signals\\n"
-            "• `/trades` - View trade history\\n"
-            "• `/performance` - Performance metrics\\n\\n"
-            "⚙️ **Bot Management**\\n"  
-            "• `/status` - Bot status & health\\n"
-            "• `/settings` - Bot configuration\\n\\n"
-            "🔄 **Reports**\\n"
-            "• Daily reports sent automatically at 8:00 UTC\\n"
-            "• Weekly reports sent on Sundays\\n"
-            "• `/generate` \- Force generate signal (if in trading session)\\n\\n"
-            "🕰 **Trading Sessions:**\\n"
-            "• London: 08:00\-17:00 UTC\\n"
-            "• New York: 13:00\-22:00 UTC\\n"
-            "• Best: 13:00\-17:00 UTC \(Overlap\)"
-        )
+        self._log_interaction(update, "help_command")
         
         await update.message.reply_text(
-            help_message,
+            HELP_MESSAGE,
             parse_mode=ParseMode.MARKDOWN_V2
         )
     
     async def _cmd_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command"""
-        await self._log_interaction(update, "status_command")
+        self._log_interaction(update, "status_command")
         
         # Get system status
-        status_data = await self._get_system_status()
+        status_data = await self._cached("status", STATUS_CACHE_TTL, self._get_system_status)
         
         status_message = (
             f"🤖 **Bot Status**\\n\\n"
-            f"🟢 **System:** {status_data['system_status']}\\n"
-            f"📊 **Data Feed:** {status_data['data_feed_status']}\\n"
-            f"🎯 **Strategy:** {status_data['active_strategy']}\\n"
-            f"📈 **Signals Today:** {status_data['signals_today']}\\n"
-            f"💰 **Daily P&L:** {status_data['daily_pnl']:+.1f} pips\\n"
-            f"📅 **Last Signal:** {status_data['last_signal_time']}\\n\\n"
-            f"⏰ **Uptime:** {status_data['uptime']}"
+            f"🟢 **System:** {_md(status_data['system_status'])}\\n"
+            f"📊 **Data Feed:** {_md(status_data['data_feed_status'])}\\n"
+            f"🗄 **Database:** {_md(status_data['database_status'])}\\n"
+            f"🎯 **Strategy:** {_md(status_data['active_strategy'])}\\n"
+            f"📈 **Signals Today:** {_md(status_data['signals_today'])}\\n"
+            f"💰 **Daily P&L:** {_md(format(status_data['daily_pnl'], '+.1f'))} pips\\n"
+            f"📅 **Last Signal:** {_md(status_data['last_signal_time'])}\\n"
+            f"🔌 **DB Pool:** {_md(status_data['db_pool'])}\\n\\n"
+            f"⏰ **Uptime:** {_md(status_data['uptime'])}"
         )
         
         await update.message.reply_text(
@@ -195,43 +422,23 @@ class TelegramBot:
     
     async def _cmd_performance(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /performance command"""
-        await self._log_interaction(update, "performance_command")
-        
-        performance_message = (
-            "📊 *Performance Summary*\n\n"
-            "*Today:*\n"
-            "• Signals: 0\n"
-            "• Trades: 0\n"
-            "• P&L: +0.0 pips\n\n"
-            "*This Week:*\n"
-            "• Signals: 0\n"
-            "• Win Rate: 0.0%\n"
-            "• Total P&L: +0.0 pips\n\n"
-            "*Trading Sessions:*\n"
-            "• London: 08:00-17:00 UTC\n"
-            "• New York: 13:00-22:00 UTC\n"
-            "• Best Time: 13:00-17:00 UTC (Overlap)"
-        )
+        self._log_interaction(update, "performance_command")
         
         await update.message.reply_text(
-            performance_message,
+            PERFORMANCE_MESSAGE,
             parse_mode=ParseMode.MARKDOWN
         )
     
     async def _cmd_generate_signal(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /generate command - Force generate a signal"""
-        await self._log_interaction(update, "generate_signal_command")
+        self._log_interaction(update, "generate_signal_command")
         
         if not self.strategy_manager:
-            await update.message.reply_text(
-                "❌ Strategy manager not available",
-                parse_mode=ParseMode.MARKDOWN
-            )
+            await update.message.reply_text("❌ Strategy manager not available")
             return
         
         # Check if in trading session
         if not self.strategy_manager.is_trading_session_active():
-            from datetime import datetime, timezone
             current_hour = datetime.now(timezone.utc).hour
             
             next_london = "08:00 UTC" if current_hour < 8 else "08:00 UTC tomorrow"
@@ -286,23 +493,16 @@ class TelegramBot:
                 
         except Exception as e:
             logger.log_error(e, {"context": "manual_signal_generation"})
-            await update.message.reply_text(
-                "❌ Error generating signal. Please try again later.",
-                parse_mode=ParseMode.MARKDOWN
-            )
+            await update.message.reply_text("❌ Error generating signal. Please try again later.")
     
     async def _cmd_signals(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /signals command"""
-        await self._log_interaction(update, "signals_command")
+        self._log_interaction(update, "signals_command")
         
         # Get recent signals from database
-        async with get_db_session() as session:
+        async with await self._new_session() as session:
             # Implementation would fetch recent signals
-            signals_message = (
-                "📡 **Recent Signals**\\n\\n"
-                "🔍 No recent signals found\\n"
-                "Next analysis in progress\\.\\.\\."
-            )
+            signals_message = SIGNALS_MESSAGE
         
         await update.message.reply_text(
             signals_message,
@@ -311,34 +511,21 @@ class TelegramBot:
     
     async def _cmd_trades(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /trades command"""
-        await self._log_interaction(update, "trades_command")
+        self._log_interaction(update, "trades_command")
         
         # Implementation would fetch recent trades
-        trades_message = (
-            "💼 **Recent Trades**\\n\\n"
-            "No recent trades to display"
-        )
-        
         await update.message.reply_text(
-            trades_message,
+            TRADES_MESSAGE,
             parse_mode=ParseMode.MARKDOWN_V2
         )
     
     async def _cmd_settings(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /settings command"""
-        await self._log_interaction(update, "settings_command")
-        
-        keyboard = [
-            [InlineKeyboardButton("🔔 Notifications", callback_data="settings_notifications")],
-            [InlineKeyboardButton("📊 Risk Management", callback_data="settings_risk")],
-            [InlineKeyboardButton("🎯 Target Pairs", callback_data="settings_pairs")],
-            [InlineKeyboardButton("📈 Strategy", callback_data="settings_strategy")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        self._log_interaction(update, "settings_command")
         
         await update.message.reply_text(
             "⚙️ **Bot Settings**\\n\\nSelect a category to configure:",
-            reply_markup=reply_markup,
+            reply_markup=SETTINGS_MARKUP,
             parse_mode=ParseMode.MARKDOWN_V2
         )
     
@@ -347,92 +534,141 @@ class TelegramBot:
         query = update.callback_query
         await query.answer()
         
-        await self._log_interaction(update, "callback_query", {"data": query.data})
+        self._log_interaction(update, "callback_query", {"data": query.data})
         
-        if query.data.startswith("settings_"):
-            setting_type = query.data.replace("settings_", "")
-            await self._handle_settings_callback(query, setting_type)
-        elif query.data.startswith("trade_"):
-            await self._handle_trade_callback(query, query.data)
+        # "settings_risk" -> settings handler with "risk"
+        prefix, _, rest = query.data.partition("_")
+        handler = self._callback_handlers.get(prefix)
+        if handler is not None:
+            await handler(query, rest)
     
     async def _handle_settings_callback(self, query, setting_type: str):
         """Handle settings-related callbacks"""
-        settings_info = {
-            "notifications": "🔔 Notifications are currently enabled\\nDaily reports: 8:00 UTC\\nWeekly reports: Sunday 10:00 UTC",
-            "risk": "📊 Current Risk Settings\\nMax risk per trade: 2%\\nDaily trade limit: 3\\nStop loss: 30 pips",
-            "pairs": "🎯 Monitored Pairs\\nForex: EURUSD, GBPUSD, USDJPY\\nCommodity: XAUUSD\\nCrypto: BTCUSDT, ETHUSDT",
-            "strategy": "📈 Active Strategy: Multi-Confluence\\nAdaptive learning enabled\\nConfluence threshold: 70%"
-        }
-        
         await query.edit_message_text(
-            f"⚙️ **Settings**\\n\\n{settings_info.get(setting_type, 'Setting not found')}",
+            f"⚙️ **Settings**\\n\\n{SETTINGS_INFO.get(setting_type, 'Setting not found')}",
             parse_mode=ParseMode.MARKDOWN_V2
         )
     
-    async def _handle_trade_callback(self, query, callback_data: str):
-        """Handle trade-related callbacks"""
+    async def _handle_trade_callback(self, query, action: str):
+        """Handle trade-related callbacks (``action`` is e.g. "taken_<signal id>")"""
         # Implementation for trade confirmations, etc.
         await query.edit_message_text("Trade callback handled")
     
     async def _handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle regular text messages"""
-        await self._log_interaction(update, "text_message", {"text": update.message.text})
+        self._log_interaction(update, "text_message", message=update.message.text)
         
         # Simple response for now
-        await update.message.reply_text(
-            "I received your message\\. Use /help to see available commands\\.",
-            parse_mode=ParseMode.MARKDOWN_V2
-        )
+        await update.message.reply_text(ECHO_MESSAGE)
+    
+    async def _send_one(self, message: Dict[str, Any]):
+        """Send a single message, holding a slot of the global send limit"""
+        async with self._send_semaphore:
+            return await self.application.bot.send_message(**message)
+    
+    async def _send_batch(self, batch: List[Dict[str, Any]]) -> List[Any]:
+        """Send messages concurrently, retrying the ones Telegram throttled
+        
+        Each entry holds the keyword arguments for ``bot.send_message``. The
+        result list is aligned with ``batch`` and contains either the sent
+        ``Message`` or the exception that the final attempt raised.
+        """
+        results: List[Any] = [None] * len(batch)
+        pending = list(range(len(batch)))
+        
+        for attempt in range(MAX_SEND_RETRIES):
+            outcomes = await asyncio.gather(
+                *(self._send_one(batch[i]) for i in pending),
+                return_exceptions=True
+            )
+            
+            throttled = []
+            retry_after = 0
+            for i, outcome in zip(pending, outcomes):
+                results[i] = outcome
+                if isinstance(outcome, RetryAfter):
+                    throttled.append(i)
+                    retry_after = max(retry_after, outcome.retry_after)
+            
+            if not throttled or attempt == MAX_SEND_RETRIES - 1:
+                break
+            
+            # Never retry sooner than Telegram asked; back off further if the
+            # limit keeps being hit
+            delay = max(retry_after, SEND_BACKOFF_BASE * 2 ** attempt)
+            logger.log_system_event("Telegram flood control, retrying messages", {
+                "count": len(throttled),
+                "retry_after": retry_after,
+                "delay": delay
+            })
+            await asyncio.sleep(delay)
+            pending = throttled
+        
+        return results
     
     async def send_signal(self, signal_data: Dict[str, Any]):
         """Send a trading signal to the user"""
+        await self.send_signals([signal_data])
+    
+    async def send_signals(self, signals: List[Dict[str, Any]]):
+        """Send several trading signals to the user concurrently"""
         if not self.chat_id:
             logger.log_system_event("No chat ID configured for sending signals")
             return
         
-        try:
-            # Format signal message
-            signal_message = self._format_signal_message(signal_data)
-            
-            # Create inline keyboard for trade confirmation
-            keyboard = [
-                [
-                    InlineKeyboardButton("✅ Trade Taken", callback_data=f"trade_taken_{signal_data['id']}"),
-                    InlineKeyboardButton("❌ Trade Skipped", callback_data=f"trade_skipped_{signal_data['id']}")
+        batch = []
+        formatted = []
+        for signal_data in signals:
+            try:
+                # Inline keyboard for trade confirmation
+                signal_id = signal_data['id']
+                keyboard = [
+                    [InlineKeyboardButton(label, callback_data=f"{prefix}{signal_id}") for label, prefix in row]
+                    for row in SIGNAL_BUTTONS
                 ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            # Send signal
-            await self.application.bot.send_message(
-                chat_id=self.chat_id,
-                text=signal_message,
-                parse_mode=ParseMode.MARKDOWN_V2,
-                reply_markup=reply_markup
-            )
-            
-            logger.log_signal(
-                signal_data['symbol'],
-                signal_data['type'],
-                signal_data
-            )
-            
-        except Exception as e:
-            logger.log_error(e, {"context": "send_signal", "signal": signal_data})
+                batch.append({
+                    "chat_id": self.chat_id,
+                    "text": self._format_signal_message(signal_data),
+                    "parse_mode": ParseMode.MARKDOWN_V2,
+                    "reply_markup": InlineKeyboardMarkup(keyboard)
+                })
+                formatted.append(signal_data)
+            except Exception as e:
+                logger.log_error(e, {"context": "send_signal", "signal": signal_data})
+        
+        results = await self._send_batch(batch)
+        
+        for signal_data, result in zip(formatted, results):
+            if isinstance(result, Exception):
+                logger.log_error(result, {"context": "send_signal", "signal": signal_data})
+            else:
+                logger.log_signal(
+                    signal_data['symbol'],
+                    signal_data['type'],
+                    signal_data
+                )
     
     async def send_message(self, message: str):
         """Send a general message to the user"""
+        await self.send_messages([message])
+    
+    async def send_messages(self, messages: List[str]):
+        """Send several general messages to the user concurrently"""
         if not self.chat_id:
             return
         
-        try:
-            await self.application.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode=ParseMode.MARKDOWN_V2
-            )
-        except Exception as e:
-            logger.log_error(e, {"context": "send_message"})
+        results = await self._send_batch([
+            {
+                "chat_id": self.chat_id,
+                "text": message,
+                "parse_mode": ParseMode.MARKDOWN_V2
+            }
+            for message in messages
+        ])
+        
+        for result in results:
+            if isinstance(result, Exception):
+                logger.log_error(result, {"context": "send_message"})
     
     def _format_signal_message(self, signal_data: Dict[str, Any]) -> str:
         """Format a trading signal message"""
@@ -452,53 +688,161 @@ class TelegramBot:
         # Format message
         message = (
             f"🎯 **TRADING SIGNAL**\\n\\n"
-            f"📊 **Pair:** {symbol}\\n"
-            f"📈 **Direction:** {signal_type}\\n"
-            f"💰 **Entry:** {entry:.5f}\\n"
-            f"🛑 **Stop Loss:** {sl:.5f}\\n"
-            f"🎯 **Take Profit:** {tp:.5f}\\n\\n"
-            f"📊 **Confluence Score:** {confluence:.1f}%\\n"
-            f"💎 **Pips Potential:** {pips_potential*10000:.0f} pips\\n\\n"
-            f"⏰ **Time:** {datetime.now(timezone.utc).strftime('%H:%M UTC')}\\n\\n"
+            f"📊 **Pair:** {_md(symbol)}\\n"
+            f"📈 **Direction:** {_md(signal_type)}\\n"
+            f"💰 **Entry:** {_md(format(entry, '.5f'))}\\n"
+            f"🛑 **Stop Loss:** {_md(format(sl, '.5f'))}\\n"
+            f"🎯 **Take Profit:** {_md(format(tp, '.5f'))}\\n\\n"
+            f"📊 **Confluence Score:** {_md(format(confluence, '.1f'))}%\\n"
+            f"💎 **Pips Potential:** {_md(format(pips_potential * 10000, '.0f'))} pips\\n\\n"
+            f"⏰ **Time:** {_utc_hhmm()}\\n\\n"
             f"Did you take this trade?"
         )
         
         return message
     
-    async def _log_interaction(self, update: Update, interaction_type: str, context_data: Dict = None):
-        """Log user interaction to database"""
+    async def _new_session(self):
+        """Open a session from the injected factory, or the module default"""
+        if self._session_factory is None:
+            return await get_db_session()
+        return self._session_factory()
+    
+    def _log_interaction(
+        self,
+        update: Update,
+        interaction_type: str,
+        context_data: Dict = None,
+        message: Optional[str] = None
+    ):
+        """Queue a user interaction for the background database writer
+        
+        A plain method rather than a coroutine: it only enqueues, so handlers
+        call it without awaiting and without a task per update. Commands are
+        identified by ``interaction_type``; free text is kept only when passed
+        as ``message``, cut to MAX_LOGGED_TEXT characters.
+        """
         try:
-            user_id = str(update.effective_user.id)
-            
-            async with get_db_session() as session:
-                interaction = UserInteraction(
-                    user_id=user_id,
-                    interaction_type=interaction_type,
-                    command=getattr(update.message, 'text', None) if update.message else None,
-                    context_data=context_data or {}
-                )
-                session.add(interaction)
-                await session.commit()
-                
+            self._interaction_queue.put_nowait({
+                "user_id": str(update.effective_user.id),
+                "interaction_type": interaction_type,
+                "message": message[:MAX_LOGGED_TEXT] if message else None,
+                "context_data": context_data or None,
+                "occurred_at": datetime.now(timezone.utc)
+            })
         except Exception as e:
             logger.log_error(e, {"context": "log_interaction"})
     
+    async def _write_interactions(self):
+        """Store queued interactions, one commit per batch
+        
+        A batch is written once it holds INTERACTION_BATCH_SIZE rows or
+        INTERACTION_FLUSH_INTERVAL has passed since its first row arrived.
+        Cancelling the writer lets a commit in progress finish, then stores
+        the rows that had not been handed to it yet.
+        """
+        loop = asyncio.get_running_loop()
+        queue = self._interaction_queue
+        batch = []
+        storing: Optional[asyncio.Task] = None
+        try:
+            while True:
+                batch.append(await queue.get())
+                deadline = loop.time() + INTERACTION_FLUSH_INTERVAL
+                while len(batch) < INTERACTION_BATCH_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                # The rows leave ``batch`` before the commit, so they are
+                # never stored a second time below
+                pending, batch = batch, []
+                storing = asyncio.create_task(self._store_interactions(pending))
+                await asyncio.shield(storing)
+        finally:
+            if storing is not None and not storing.done():
+                await storing
+            # Don't drop interactions that were queued right before shutdown
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                await self._store_interactions(batch)
+    
+    async def _store_interactions(self, batch: List[Dict[str, Any]]):
+        """Persist one batch of user interactions"""
+        try:
+            async with await self._new_session() as session:
+                session.add_all([UserInteraction(**row) for row in batch])
+                await session.commit()
+        except Exception as e:
+            # Only this batch is lost; the writer keeps draining the queue
+            logger.log_error(e, {"context": "log_interaction", "batch_size": len(batch)})
+    
+    async def _cached(self, key: str, ttl: float, producer: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a recent result of ``producer``, calling it at most once per ``ttl``
+        
+        Concurrent callers for the same key wait on one in-flight call instead
+        of each running the producer.
+        """
+        async with self._reply_cache_locks[key]:
+            entry = self._reply_cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            
+            value = await producer()
+            self._reply_cache[key] = (time.monotonic() + ttl, value)
+            return value
+    
     async def _get_system_status(self) -> Dict[str, Any]:
-        """Get current system status"""
-        # This would be implemented with actual system checks
+        """Get current system status
+        
+        The database check is bounded by STATUS_PROBE_TIMEOUT, so a slow
+        database can't stall /status.
+        """
+        strategy = self.strategy_manager
+        database_status = await self._probe("database", self._probe_database(), "Unavailable")
+        
+        if self.market_data is None:
+            data_feed_status = "Not configured"
+        else:
+            data_feed_status = "Connected" if self.market_data.running else "Stopped"
+        
+        last_signal = strategy.last_signal_time if strategy else None
+        pool = get_pool_stats()
         return {
             "system_status": "Online",
-            "data_feed_status": "Connected",
+            "data_feed_status": data_feed_status,
+            "database_status": database_status,
             "active_strategy": "Multi-Confluence", 
-            "signals_today": 0,
+            "signals_today": strategy.signals_today if strategy else 0,
             "daily_pnl": 0.0,
-            "last_signal_time": "No signals today",
-            "uptime": "Just started"
+            "last_signal_time": last_signal.strftime('%H:%M UTC') if last_signal else "No signals today",
+            "uptime": "Just started",
+            "db_pool": (
+                f"{pool['checked_out']} in use, {pool['idle']} idle" if pool else "Not connected"
+            )
         }
+    
+    async def _probe(self, name: str, check: Awaitable[Any], fallback: Any) -> Any:
+        """Run one status check, returning ``fallback`` if it fails or is too slow"""
+        try:
+            return await asyncio.wait_for(check, timeout=STATUS_PROBE_TIMEOUT)
+        except Exception as e:
+            logger.log_error(e, {"context": f"status_probe_{name}"})
+            return fallback
+    
+    async def _probe_database(self) -> str:
+        """Round-trip a trivial query"""
+        async with await self._new_session() as session:
+            await session.execute(text("SELECT 1"))
+        return "Connected"
 
 def verify_bot_token() -> bool:
     """Verify that the bot token is valid"""
-    token = os.getenv('TELEGRAM_BOT_TOKEN')
+    token = CFG.telegram_bot_token
     if not token:
         return False
     
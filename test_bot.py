@@ -20,8 +20,8 @@ async def test_components():
     print("🔧 Testing bot components...")
     
     # Test environment variables
-    required_vars = ['TELEGRAM_BOT_TOKEN', 'DATABASE_URL', 'ALPHA_VANTAGE_API_KEY']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    from config import CFG
+    missing_vars = CFG.missing_required()
     
     if missing_vars:
         print(f"❌ Missing environment variables: {missing_vars}")
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# bot.py lives at the repo root; modules under src/ import each other by bare
+# name, as bot.py arranges
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
@@ -0,0 +1,89 @@
+import asyncio
+
+
+class FakeUpdater:
+    def __init__(self):
+        self.running = False
+    
+    async def start_polling(self, **kwargs):
+        self.running = True
+    
+    async def stop(self):
+        self.running = False
+
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+    
+    async def send_message(self, **kwargs):
+        self.sent.append(kwargs)
+    
+    async def set_webhook(self, **kwargs):
+        pass
+
+
+class FakeApplication:
+    """Just enough of telegram.ext.Application for TelegramBot.start()/stop()"""
+    
+    def __init__(self):
+        self.running = False
+        self.shut_down = False
+        self.updater = FakeUpdater()
+        self.bot = FakeBot()
+        self.update_queue = asyncio.Queue()
+    
+    # Builder chain
+    @classmethod
+    def builder(cls):
+        return cls()
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+    
+    def build(self):
+        return self
+    
+    def add_handler(self, handler):
+        pass
+    
+    def add_error_handler(self, handler):
+        pass
+    
+    async def initialize(self):
+        pass
+    
+    async def start(self):
+        self.running = True
+    
+    async def stop(self):
+        self.running = False
+    
+    async def shutdown(self):
+        self.shut_down = True
+
+
+class FakeSession:
+    """Async session that records each committed batch of added objects"""
+    
+    def __init__(self, commits, commit_delay=None):
+        self._commits = commits
+        self._commit_delay = commit_delay
+        self._added = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    def add_all(self, objects):
+        self._added.extend(objects)
+    
+    async def commit(self):
+        # The rows are on the server before the commit returns, as when a
+        # cancellation arrives while waiting for the database's reply
+        self._commits.append(self._added)
+        self._added = []
+        if self._commit_delay is not None:
+            await self._commit_delay()
@@ -0,0 +1,53 @@
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import data_handler
+from data_handler import MarketDataHandler, to_market_rows
+
+
+def test_alpha_vantage_rows_keep_api_precision():
+    data = {
+        'symbol': 'EURUSD',
+        'timeframe': '1m',
+        'source': 'alpha_vantage',
+        'meta_data': {'6. Time Zone': 'US/Eastern'},
+        'data': {
+            '2024-01-02 09:31:00': {
+                '1. open': '1.09412', '2. high': '1.09437', '3. low': '1.09401',
+                '4. close': '1.09433', '5. volume': '123456789'
+            }
+        }
+    }
+    
+    assert to_market_rows(data) == [(
+        'EURUSD', '1m', datetime(2024, 1, 2, 9, 31, tzinfo=ZoneInfo('US/Eastern')),
+        1.09412, 1.09437, 1.09401, 1.09433, 123456789.0
+    )]
+
+
+def test_market_cache_is_reused_within_collection_cycle(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(data_handler.time, 'monotonic', lambda: clock[0])
+    fetches = []
+    
+    async def fetch():
+        fetches.append(clock[0])
+        return [['1700000000000', '1', '2', '0.5', '1.5', '10', '15']]
+    
+    async def scenario():
+        handler = MarketDataHandler()
+        key = 'shared:market:bybit:BTCUSDT:1'
+        first = await handler._cached_fetch(key, data_handler.MARKET_CACHE_TTL, fetch)
+        
+        # Error retry of the same cycle: served from memory
+        clock[0] += 60
+        assert await handler._cached_fetch(key, data_handler.MARKET_CACHE_TTL, fetch) is first
+        assert len(fetches) == 1
+        
+        # Next cycle: fetched fresh
+        clock[0] = 1000.0 + data_handler.COLLECTION_INTERVAL
+        await handler._cached_fetch(key, data_handler.MARKET_CACHE_TTL, fetch)
+        assert len(fetches) == 2
+    
+    asyncio.run(scenario())
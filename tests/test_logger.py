@@ -0,0 +1,60 @@
+import logging
+import math
+
+from logger import TRADE_RECORD, BinaryTradeHandler, BufferedRotatingFileHandler, read_binary_trade_log
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord('test', logging.ERROR, __file__, 0, message, None, None)
+
+
+def test_delayed_handler_keeps_records_across_rollover(tmp_path):
+    path = tmp_path / 'errors.log'
+    handler = BufferedRotatingFileHandler(str(path), maxBytes=64, backupCount=5, delay=True)
+    messages = [f"record {i:02d} " + 'x' * 20 for i in range(10)]
+    try:
+        for message in messages:
+            handler.emit(_record(message))
+    finally:
+        handler.close()
+    
+    files = sorted(tmp_path.glob('errors.log.*'), reverse=True) + [path]
+    assert len(files) > 1
+    written = [line for f in files for line in f.read_text().splitlines()]
+    assert written == messages
+
+
+def test_binary_trade_log_round_trip(tmp_path):
+    path = str(tmp_path / 'trades.bin')
+    trades = [
+        (1_700_000_000_000_000_001, 'EURUSD', 'BUY', 1.09412, 1000.0, None),
+        (1_700_000_000_000_000_002, 'BTCUSDT', 'SIGNAL_SELL', 42000.5, None, None),
+        (1_700_000_000_000_000_003, 'EURUSD', 'SELL', 1.09433, 1000.0, 0.21),
+    ]
+    
+    handler = BinaryTradeHandler(path)
+    for trade in trades[:2]:
+        record = _record('trade')
+        record.trade_record = trade
+        handler.handle(record)
+    handler.close()
+    
+    # Reopened handlers keep the ids from the names sidecar
+    handler = BinaryTradeHandler(path)
+    record = _record('trade')
+    record.trade_record = trades[2]
+    handler.handle(record)
+    handler.handle(_record('not a trade'))
+    handler.close()
+    
+    # EURUSD was not interned a second time
+    assert len((tmp_path / 'trades.bin.names').read_text().splitlines()) == 5
+    assert TRADE_RECORD.size == 37
+    assert (tmp_path / 'trades.bin').stat().st_size == len(trades) * TRADE_RECORD.size
+    
+    decoded = read_binary_trade_log(path)
+    assert [(r['timestamp_ns'], r['symbol'], r['action']) for r in decoded] == [t[:3] for t in trades]
+    for r, (*_, price, quantity, pnl) in zip(decoded, trades):
+        # Missing values are stored as NaN
+        for value, expected in ((r['price'], price), (r['quantity'], quantity), (r['pnl'], pnl)):
+            assert math.isnan(value) if expected is None else value == expected
@@ -0,0 +1,111 @@
+import asyncio
+import dataclasses
+from datetime import datetime, timezone
+
+import pytest
+
+import telegram_handler
+from telegram_handler import TelegramBot
+
+from fakes import FakeApplication, FakeSession
+
+
+@pytest.fixture
+def cfg(monkeypatch):
+    def configure(**overrides):
+        config = dataclasses.replace(
+            telegram_handler.CFG, telegram_bot_token='123:abc', telegram_chat_id='42', **overrides
+        )
+        monkeypatch.setattr(telegram_handler, 'CFG', config)
+        return config
+    return configure
+
+
+@pytest.fixture
+def fake_application(monkeypatch):
+    monkeypatch.setattr(telegram_handler, 'Application', FakeApplication)
+    monkeypatch.setattr(telegram_handler, 'HTTPXRequest', lambda **kwargs: None)
+
+
+def test_stop_during_startup_is_not_lost(cfg, fake_application, monkeypatch):
+    cfg(webhook_url=None, webhook_secret=None)
+    
+    async def scenario():
+        bot = TelegramBot()
+        
+        async def stop_while_warming(*args, **kwargs):
+            await bot.stop()
+        monkeypatch.setattr(telegram_handler, 'warm_connection_pool', stop_while_warming)
+        
+        await asyncio.wait_for(bot.start(), timeout=5)
+        return bot
+    
+    bot = asyncio.run(scenario())
+    assert not bot.application.running
+    assert not bot.application.updater.running
+    assert bot.application.shut_down
+    assert bot.application.bot.sent == []
+
+
+def _interaction(i):
+    return {
+        "user_id": str(i),
+        "interaction_type": "command",
+        "message": None,
+        "context_data": None,
+        "occurred_at": datetime.now(timezone.utc)
+    }
+
+
+def test_interactions_are_written_in_batches(cfg):
+    cfg()
+    commits = []
+    
+    async def scenario():
+        bot = TelegramBot(session_factory=lambda: FakeSession(commits))
+        count = 2 * telegram_handler.INTERACTION_BATCH_SIZE + 50
+        for i in range(count):
+            bot._interaction_queue.put_nowait(_interaction(i))
+        writer = asyncio.create_task(bot._write_interactions())
+        while sum(map(len, commits)) < count:
+            await asyncio.sleep(0.01)
+        writer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await writer
+    
+    asyncio.run(scenario())
+    assert [len(batch) for batch in commits] == [
+        telegram_handler.INTERACTION_BATCH_SIZE, telegram_handler.INTERACTION_BATCH_SIZE, 50
+    ]
+
+
+def test_cancel_during_commit_stores_each_interaction_once(cfg):
+    cfg()
+    commits = []
+    
+    async def scenario():
+        committing = asyncio.Event()
+        release = asyncio.Event()
+        
+        async def slow_commit():
+            committing.set()
+            await release.wait()
+        
+        bot = TelegramBot(session_factory=lambda: FakeSession(commits, slow_commit))
+        writer = asyncio.create_task(bot._write_interactions())
+        for i in range(3):
+            bot._interaction_queue.put_nowait(_interaction(i))
+        await committing.wait()
+        
+        # Queued while the first batch is being committed
+        for i in range(3, 5):
+            bot._interaction_queue.put_nowait(_interaction(i))
+        writer.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await writer
+    
+    asyncio.run(scenario())
+    stored = [row.user_id for batch in commits for row in batch]
+    assert sorted(stored) == [str(i) for i in range(5)]
@@ -0,0 +1,104 @@
+import asyncio
+import dataclasses
+import os
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+import config
+import telegram_handler
+from telegram_handler import TelegramBot
+
+from fakes import FakeApplication
+
+SECRET = 's3cret'
+
+
+@pytest.fixture(scope='module')
+def bot_module(tmp_path_factory):
+    # bot.py sets up logging into ./logs at import
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('bot'))
+    try:
+        import bot
+    finally:
+        os.chdir(cwd)
+    return bot
+
+
+@pytest.fixture
+def webhook_cfg(monkeypatch):
+    def configure(secret):
+        cfg = dataclasses.replace(
+            telegram_handler.CFG,
+            telegram_bot_token='123:abc',
+            webhook_url='https://example.com/telegram',
+            webhook_secret=secret
+        )
+        monkeypatch.setattr(telegram_handler, 'CFG', cfg)
+        return cfg
+    return configure
+
+
+def test_webhook_url_requires_secret():
+    base = dataclasses.replace(
+        config.CFG, telegram_bot_token='123:abc', database_url='postgresql://', alpha_vantage_api_key='key'
+    )
+    assert dataclasses.replace(base, webhook_url=None, webhook_secret=None).missing_required() == []
+    assert dataclasses.replace(
+        base, webhook_url='https://example.com/telegram', webhook_secret=None
+    ).missing_required() == ['WEBHOOK_SECRET']
+    assert dataclasses.replace(
+        base, webhook_url='https://example.com/telegram', webhook_secret=SECRET
+    ).missing_required() == []
+
+
+def test_bot_refuses_webhook_without_secret(webhook_cfg):
+    webhook_cfg(None)
+    with pytest.raises(ValueError):
+        TelegramBot()
+
+
+def test_secret_is_required_to_match(webhook_cfg, monkeypatch):
+    webhook_cfg(SECRET)
+    bot = TelegramBot()
+    assert bot.webhook_secret_matches(SECRET)
+    assert not bot.webhook_secret_matches('wrong')
+    assert not bot.webhook_secret_matches(None)
+    
+    monkeypatch.setattr(telegram_handler, 'CFG', dataclasses.replace(telegram_handler.CFG, webhook_secret=None))
+    assert not bot.webhook_secret_matches(None)
+    assert not bot.webhook_secret_matches('')
+
+
+def test_webhook_route(bot_module, webhook_cfg):
+    webhook_cfg(SECRET)
+    
+    async def scenario():
+        orchestrator = bot_module.TradingBotOrchestrator()
+        orchestrator.telegram_bot = TelegramBot()
+        application = orchestrator.telegram_bot.application = FakeApplication()
+        application.running = True
+        
+        app = web.Application()
+        app.router.add_post('/telegram', orchestrator.telegram_webhook)
+        async with TestClient(TestServer(app)) as client:
+            headers = {'X-Telegram-Bot-Api-Secret-Token': SECRET}
+            
+            response = await client.post('/telegram', data='{not json', headers=headers)
+            assert response.status == 400
+            
+            response = await client.post('/telegram', json={'update_id': 1})
+            assert response.status == 403
+            
+            response = await client.post('/telegram', json={'update_id': 1}, headers=headers)
+            assert response.status == 200
+            assert application.update_queue.get_nowait().update_id == 1
+            
+            application.running = False
+            response = await client.post('/telegram', json={'update_id': 2}, headers=headers)
+            assert response.status == 503
+        assert application.update_queue.empty()
+    
+    asyncio.run(scenario())